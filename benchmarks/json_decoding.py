@@ -0,0 +1,124 @@
+"""Compare the actionApi decoding path against the previous stdlib full-decode path.
+
+Measures throughput (decodes per second) and allocations (tracemalloc block
+count and peak bytes per decode) for each endpoint. Recorded response bodies
+can be passed as files named after their endpoint, e.g. ``timers.json``,
+``temperature.json`` or ``chemistry.json`` (anything after an underscore is a
+variant, e.g. ``temperature_heater.json``); built-in payloads shaped like real
+responses are used for any endpoint without one.
+
+Usage:
+    python benchmarks/json_decoding.py [--number 20000] [payload files...]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import timeit
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DECODING_PATH = os.path.join(REPO_ROOT, "custom_components", "insnrg_chlorinator", "decoding.py")
+
+_LIVE_DATA = {
+    "temp": 24.5, "orp": 712, "ph": 7.4, "salt": 4100, "flow": 1, "pumpSpeed": 2,
+    "heater": {"mode": 0, "setPoint": 28, "temp": None}, "lights": [{"zone": z, "on": 0} for z in range(4)],
+}
+SAMPLE_PAYLOADS = {
+    "timers": {
+        "timers": [
+            {"timerNumber": n, "start": f"0{6 + n}:00", "stop": f"1{n}:00", "chlorinator": 1, "enable": int(n < 2),
+             "speed": 2, "days": [1, 1, 1, 1, 1, 1, 1]}
+            for n in range(1, 5)
+        ],
+    },
+    "temperature": {
+        "system": {"systemId": 12345, "name": "Pool", "liveData": json.dumps(_LIVE_DATA), "isActive": True},
+        "devices": [{"id": d, "type": "light", "state": 0} for d in range(8)],
+    },
+    # Only a nested heater temperature, which must not be taken for the pool temperature
+    "temperature_nested": {
+        "system": {"systemId": 12345, "name": "Pool", "liveData": json.dumps({"orp": 712, "heater": {"temp": 31}})},
+    },
+    "chemistry": {
+        "poolChemistry": {"currentPh": "7.4", "setPointPh": "7.2", "currentORP": "712", "setPointORP": "650"},
+        "history": [{"ph": 7.3, "orp": 700, "at": f"2024-01-{d:02d}"} for d in range(1, 29)],
+    },
+}
+
+
+def load_decoding():
+    """Load decoding.py directly, so Home Assistant doesn't have to be installed."""
+    spec = importlib.util.spec_from_file_location("insnrg_decoding", DECODING_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def baseline_decoders():
+    """The decoding the coordinator did before decoding.py: full stdlib decodes of every level."""
+    def timers(body):
+        return json.loads(body).get("timers", [])
+
+    def temperature(body):
+        data = json.loads(body)
+        return json.loads(data.get("system", {}).get("liveData", "{}")).get("temp", None)
+
+    def chemistry(body):
+        return json.loads(body).get("poolChemistry", {})
+
+    return {"timers": timers, "temperature": temperature, "chemistry": chemistry}
+
+
+def allocations(decode, body, repeat=200):
+    """Return (blocks allocated per decode, peak bytes) for a decoder."""
+    decode(body)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [decode(body) for _ in range(repeat)]
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return blocks / repeat, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("payloads", nargs="*", help="recorded response bodies, named <endpoint>.json")
+    parser.add_argument("--number", type=int, default=20000, help="decodes per measurement")
+    args = parser.parse_args()
+
+    bodies = {name: json.dumps(payload).encode() for name, payload in SAMPLE_PAYLOADS.items()}
+    for path in args.payloads:
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "rb") as payload:
+            bodies[name] = payload.read()
+
+    decoding = load_decoding()
+    candidates = {
+        "baseline": baseline_decoders(),
+        decoding.JSON_BACKEND: {
+            "timers": decoding.decode_timers,
+            "temperature": decoding.decode_temperature,
+            "chemistry": decoding.decode_chemistry,
+        },
+    }
+
+    print(f"{'endpoint':<18} {'decoder':<9} {'bytes':>6} {'decodes/s':>11} {'blocks':>7} {'peak KiB':>9}")
+    for name, body in bodies.items():
+        results = set()
+        endpoint = name.split("_", 1)[0]
+        for label, decoders in candidates.items():
+            decode = decoders[endpoint]
+            results.add(repr(decode(body)))
+            seconds = timeit.timeit(lambda: decode(body), number=args.number)
+            blocks, peak = allocations(decode, body)
+            print(f"{name:<18} {label:<9} {len(body):>6} {args.number / seconds:>11,.0f} {blocks:>7.1f} {peak / 1024:>9.1f}")
+        if len(results) != 1:
+            print(f"    WARNING: decoders disagree on {name}: {sorted(results)}")
+
+
+if __name__ == "__main__":
+    main()
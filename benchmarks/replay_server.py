@@ -0,0 +1,138 @@
+"""Serve a recorded INSNRG traffic file locally, for offline profiling and load tests.
+
+Recordings come from the ``insnrg_chlorinator.record_traffic`` service. The
+server answers actionApi, system ID and Cognito token refresh requests with
+the recorded responses, cycling through them in order for each kind of
+request. Recorded latencies can be replayed, sped up or dropped, and extra
+latency and errors can be injected.
+
+Drive the integration against it from a script by passing its URLs in:
+``api_url="http://127.0.0.1:8765/prod/actionApi"`` to the coordinator and
+``endpoint="http://127.0.0.1:8765/"`` to ``async_refresh_tokens``. The shipped
+integration always talks to INSNRG and Cognito.
+
+Usage:
+    python benchmarks/replay_server.py recording.jsonl.gz [--port 8765] [--speed 10]
+        [--latency 50] [--jitter 20] [--error-rate 0.05] [--error-status 503 429]
+"""
+import argparse
+import asyncio
+import gzip
+import itertools
+import json
+import random
+import uuid
+from collections import Counter, defaultdict
+
+from aiohttp import web
+
+COGNITO_TARGET = "AWSCognitoIdentityProviderService.InitiateAuth"
+
+
+def load_recording(path):
+    """Return the recorded responses grouped by (kind, actionApi params), in recorded order."""
+    exchanges = defaultdict(list)
+    with gzip.open(path, "rt", encoding="utf-8") as recording:
+        for line in recording:
+            if not line.strip():
+                continue
+            exchange = json.loads(line)
+            params = exchange["request"].get("params") if exchange["kind"] == "action" else None
+            exchanges[(exchange["kind"], params)].append(exchange)
+    return exchanges
+
+
+def fill_tokens(value):
+    """Swap redacted tokens for fresh fake ones, so clients see tokens that change like real ones."""
+    if isinstance(value, dict):
+        return {key: fill_tokens(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill_tokens(item) for item in value]
+    if value == "<redacted>":
+        return f"replay-{uuid.uuid4().hex}"
+    return value
+
+
+class ReplayServer:
+    def __init__(self, exchanges, speed, latency, jitter, error_rate, error_statuses):
+        self._cycles = {key: itertools.cycle(items) for key, items in exchanges.items()}
+        self._speed = speed
+        self._latency = latency / 1000
+        self._jitter = jitter / 1000
+        self._error_rate = error_rate
+        self._error_statuses = error_statuses
+        self.served = Counter()
+        self.errors = Counter()
+
+    async def _respond(self, key):
+        cycle = self._cycles.get(key)
+        if cycle is None:
+            self.errors[key] += 1
+            return web.json_response({"message": f"Nothing recorded for {key}"}, status=404)
+        exchange = next(cycle)
+
+        delay = (exchange["latency"] / self._speed if self._speed else 0) + self._latency
+        delay += random.uniform(-self._jitter, self._jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if random.random() < self._error_rate:
+            self.errors[key] += 1
+            return web.json_response({"message": "Injected error"}, status=random.choice(self._error_statuses))
+
+        self.served[key] += 1
+        body = exchange["body"]
+        if key[0] == "cognito":
+            body = fill_tokens(body)
+        text = body if isinstance(body, str) else json.dumps(body)
+        return web.Response(text=text, status=exchange["status"], content_type="application/json")
+
+    async def action(self, request):
+        body = await request.json()
+        return await self._respond(("action", body.get("params")))
+
+    async def system_ids(self, request):
+        return await self._respond(("system_ids", None))
+
+    async def cognito(self, request):
+        if request.headers.get("X-Amz-Target") != COGNITO_TARGET:
+            return web.json_response({"__type": "UnknownOperationException"}, status=400)
+        return await self._respond(("cognito", None))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="gzip-compressed JSON Lines file from the record_traffic service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="divide recorded latencies by this factor; 0 drops them entirely")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra latency per response, in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- variation of the extra latency, in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[503],
+                        help="HTTP statuses used for injected errors")
+    args = parser.parse_args()
+
+    exchanges = load_recording(args.recording)
+    for (kind, params), items in sorted(exchanges.items(), key=lambda item: str(item[0])):
+        print(f"{kind:<11} {params or '':<18} {len(items):>5} responses")
+
+    server = ReplayServer(exchanges, args.speed, args.latency, args.jitter, args.error_rate, args.error_status)
+    app = web.Application()
+    app.router.add_post("/prod/actionApi", server.action)
+    app.router.add_post("/prod/all", server.system_ids)
+    app.router.add_post("/", server.cognito)
+
+    async def report(_app):
+        for key, count in sorted(server.served.items(), key=str):
+            print(f"served {count:>7} {key}")
+        for key, count in sorted(server.errors.items(), key=str):
+            print(f"errors {count:>7} {key}")
+
+    app.on_cleanup.append(report)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Report how long the INSNRG Chlorinator integration takes to import and set up.
+
+Import time is measured in a fresh interpreter with ``python -X importtime``,
+so Home Assistant must be installed in the environment running this script.
+Setup time is read from a Home Assistant log captured with debug logging
+enabled for ``custom_components.insnrg_chlorinator``.
+
+Usage:
+    python benchmarks/startup.py [--log /config/home-assistant.log] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "custom_components.insnrg_chlorinator",
+    "custom_components.insnrg_chlorinator.sensor",
+    "custom_components.insnrg_chlorinator.config_flow",
+]
+SETUP_LINE = re.compile(r"Setup of entry (\S+) took ([0-9.]+) s")
+
+
+def import_times(module):
+    """Import a module in a fresh interpreter and return [(cumulative_us, name)] from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times.append((int(cumulative), name.strip()))
+    return times
+
+
+def report_imports(top):
+    for module in MODULES:
+        times = import_times(module)
+        total = next((us for us, name in times if name == module), 0)
+        print(f"{module}: {total / 1000:.1f} ms cumulative")
+        # Heaviest third-party imports pulled in by the integration, excluding Home Assistant itself
+        heavy = sorted(
+            ((us, name) for us, name in times
+             if "." not in name and name not in ("homeassistant", "custom_components")),
+            reverse=True,
+        )
+        for us, name in heavy[:top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+
+def report_setup(log_path):
+    with open(log_path, encoding="utf-8") as log:
+        timings = [(m.group(1), float(m.group(2))) for m in map(SETUP_LINE.search, log) if m]
+    if not timings:
+        print(f"No setup timings found in {log_path}; is debug logging enabled for the integration?")
+        return
+    for entry_id, seconds in timings:
+        print(f"async_setup_entry {entry_id}: {seconds:.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", help="Home Assistant log file to read async_setup_entry timings from")
+    parser.add_argument("--top", type=int, default=10, help="number of heaviest imports to list")
+    args = parser.parse_args()
+
+    report_imports(args.top)
+    if args.log:
+        report_setup(args.log)
+
+
+if __name__ == "__main__":
+    main()
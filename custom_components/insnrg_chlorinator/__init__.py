@@ -1,16 +1,56 @@
+import asyncio
 import logging
+import time
+import voluptuous as vol
+from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers import config_validation as cv
 from homeassistant.core import (
     HomeAssistant,
     ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
 )
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 from homeassistant.const import (
     Platform,
 )
-from .const import DOMAIN, API_URL
+from .const import (
+    DOMAIN,
+    API_URL,
+    SCAN_INTERVAL,
+    SERVICE_REFRESH,
+    ATTR_SECTIONS,
+    ATTR_ENTRY_ID,
+    REFRESH_SECTIONS,
+    SERVICE_EXPORT_HISTORY,
+    ATTR_FORMAT,
+    ATTR_START,
+    ATTR_END,
+    ATTR_SYSTEM_ID,
+    ATTR_FILENAME,
+    EXPORT_FORMATS,
+    SERVICE_RECORD_TRAFFIC,
+    ATTR_DURATION,
+    DEFAULT_RECORDING_DURATION,
+    CONF_TIMERS_INTERVAL,
+    CONF_TEMPERATURE_INTERVAL,
+    CONF_CHEMISTRY_INTERVAL,
+    DEFAULT_TIMERS_INTERVAL,
+    DEFAULT_TEMPERATURE_INTERVAL,
+    DEFAULT_CHEMISTRY_INTERVAL,
+    CONF_FILTER_WINDOW,
+    DEFAULT_FILTER_WINDOW,
+)
+from .auth import async_get_token_manager, async_release_token_manager
 from .coordinator import InsnrgChlorinatorCoordinator  # Import the new coordinator
+from .export import async_export_history, export_path
+from .fleet import async_get_fleet
+from .traffic import async_get_traffic_recorder, async_start_recording, async_stop_recording
+from .store import SnapshotStore
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 PLATFORMS = [Platform.SENSOR]
@@ -21,34 +61,153 @@ async def async_setup(hass: HomeAssistant, config: ConfigType | None) -> bool:
     #_LOGGER.debug("Setting up INSNRG Chlorinator")
     # Perform any global setup here, if needed.
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_handle_refresh(call: ServiceCall):
+        """Ask the selected coordinators for fresh data; their debouncers merge overlapping calls."""
+        sections = call.data.get(ATTR_SECTIONS) or REFRESH_SECTIONS
+        entry_ids = call.data.get(ATTR_ENTRY_ID)
+        coordinators = [
+            entry_data["coordinator"]
+            for entry_id, entry_data in hass.data[DOMAIN].items()
+            if not entry_ids or entry_id in entry_ids
+        ]
+        _LOGGER.debug("Refresh of %s requested for %d entries", ", ".join(sections), len(coordinators))
+        await asyncio.gather(*(coordinator.async_request_sections(sections) for coordinator in coordinators))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_handle_refresh,
+        schema=vol.Schema({
+            vol.Optional(ATTR_SECTIONS): vol.All(cv.ensure_list, [vol.In(REFRESH_SECTIONS)]),
+            vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        }),
+    )
+
+    async def async_handle_export_history(call: ServiceCall) -> ServiceResponse:
+        """Write the sample history of every loaded entry to a file under the config directory."""
+        fmt = call.data[ATTR_FORMAT]
+        path = export_path(hass, call.data.get(ATTR_FILENAME), fmt)
+        # Times without a zone are in Home Assistant's time zone
+        start = dt_util.as_utc(call.data[ATTR_START]) if ATTR_START in call.data else None
+        end = dt_util.as_utc(call.data[ATTR_END]) if ATTR_END in call.data else None
+        coordinators = [entry_data["coordinator"] for entry_data in hass.data[DOMAIN].values()]
+        try:
+            samples = await async_export_history(
+                hass, coordinators, fmt, path, start, end, call.data.get(ATTR_SYSTEM_ID)
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Could not write {path}: {err}") from err
+        return {"path": path, "samples": samples}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_handle_export_history,
+        schema=vol.Schema({
+            vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+            vol.Optional(ATTR_START): cv.datetime,
+            vol.Optional(ATTR_END): cv.datetime,
+            vol.Optional(ATTR_SYSTEM_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_FILENAME): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_handle_record_traffic(call: ServiceCall) -> ServiceResponse:
+        """Record sanitized API and Cognito exchanges for a while, for replay with benchmarks/replay_server.py."""
+        if async_get_traffic_recorder(hass) is not None:
+            raise HomeAssistantError("INSNRG traffic is already being recorded")
+        path = export_path(hass, call.data.get(ATTR_FILENAME), "jsonl.gz", prefix="insnrg_traffic")
+        try:
+            recorder = await async_start_recording(hass, path)
+        except OSError as err:
+            raise HomeAssistantError(f"Could not write {path}: {err}") from err
+
+        async def async_stop(_now):
+            # A later recording may have replaced this one
+            if async_get_traffic_recorder(hass) is recorder:
+                await async_stop_recording(hass)
+
+        async_call_later(hass, timedelta(minutes=call.data[ATTR_DURATION]), async_stop)
+        return {"path": path}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        async_handle_record_traffic,
+        schema=vol.Schema({
+            vol.Optional(ATTR_DURATION, default=DEFAULT_RECORDING_DURATION): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+            vol.Optional(ATTR_FILENAME): cv.string,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     return True
 
+def _endpoint_intervals(options):
+    """Map the per-endpoint interval options (minutes) to the coordinator's endpoint names."""
+    def interval(key, default):
+        return timedelta(minutes=options[key]) if key in options else default
+    return {
+        "timers": interval(CONF_TIMERS_INTERVAL, DEFAULT_TIMERS_INTERVAL),
+        "temperature": interval(CONF_TEMPERATURE_INTERVAL, DEFAULT_TEMPERATURE_INTERVAL),
+        "chemistry": interval(CONF_CHEMISTRY_INTERVAL, DEFAULT_CHEMISTRY_INTERVAL),
+    }
+
+async def _async_options_updated(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Apply changed refresh intervals and filter window without reloading.
+
+    This also fires when refreshed tokens are written back to the entry, so it must stay cheap.
+    """
+    entry_data = hass.data[DOMAIN].get(config_entry.entry_id)
+    if entry_data:
+        entry_data["coordinator"].async_set_intervals(_endpoint_intervals(config_entry.options))
+        entry_data["coordinator"].async_set_filter_window(config_entry.options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW))
+
+async def _async_delayed_refresh(coordinator: InsnrgChlorinatorCoordinator, delay: timedelta):
+    if delay:
+        await asyncio.sleep(delay.total_seconds())
+    await coordinator.async_refresh()
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Set up INSNRG Chlorinator from a config entry."""
     _LOGGER.debug("Setting up entry for INSNRG Chlorinator with entry_id: %s", config_entry.entry_id)
+    setup_start = time.monotonic()
 
-    # Extract tokens from config_entry
-    access_token = config_entry.data.get("access_token")
-    expiry = config_entry.data.get("expiry")
-    refresh_token = config_entry.data.get("refresh_token")
-    id_token = config_entry.data.get("id_token")
-    system_id = config_entry.data.get("system_id")
+    # Share one token set with any other entries of the same login
+    tokens = async_get_token_manager(hass, config_entry)
+    # Entries created before multi-system support only know a single system
+    system_ids = config_entry.data.get("systems") or [config_entry.data.get("system_id")]
 
     # Set up the coordinator
+    store = SnapshotStore(hass, config_entry.entry_id)
+    # Each entry's stable phase within the refresh interval, so entries don't all poll at once
+    phase = async_get_fleet(hass).stagger_offset(config_entry.entry_id, SCAN_INTERVAL)
     coordinator = InsnrgChlorinatorCoordinator(
         hass,
         api_url=API_URL,
-        system_id=system_id,
-        token=access_token,
-        expiry=expiry,
-        refresh_token=refresh_token,
-        id_token=id_token,
+        system_ids=system_ids,
+        tokens=tokens,
+        store=store,
+        intervals=_endpoint_intervals(config_entry.options),
+        filter_window=config_entry.options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW),
+        phase=phase,
     )
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
-
-    _LOGGER.debug("First refresh complete")
+    # Start from the cached snapshot if there is one, otherwise fetch initial data
+    cached = await store.async_load()
+    if cached:
+        _LOGGER.debug("Starting from cached data, refreshing in the background")
+        coordinator.async_restore(cached, store.history, store.statistics)
+    else:
+        # Not delayed by the phase: without cached data, setup has to wait for this refresh
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Setup will be retried from scratch, so don't keep writing tokens to this entry meanwhile
+            async_release_token_manager(hass, config_entry)
+            raise
+        _LOGGER.debug("First refresh complete")
 
     hass.data[DOMAIN][config_entry.entry_id] = {
         "data": config_entry.data,
@@ -56,10 +215,19 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         "sensors": []
     }
 
+    config_entry.async_on_unload(config_entry.add_update_listener(_async_options_updated))
+
     # Set up sensors
     _LOGGER.debug("Creating tasks for sensor setup")
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    if cached:
+        # Spread entries over the refresh interval so a restart doesn't make them all poll at once
+        _LOGGER.debug("Refreshing cached data for entry %s in %s", config_entry.entry_id, phase)
+        config_entry.async_create_background_task(
+            hass, _async_delayed_refresh(coordinator, phase), f"{DOMAIN} refresh of cached data"
+        )
+
     # Verify that sensors are set up correctly by adding a check after forward_entry_setups
     sensors = hass.data[DOMAIN][config_entry.entry_id]["sensors"]
     if not sensors:
@@ -69,6 +237,8 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         sensor_info = ", ".join([f"{sensor.name} (state: {sensor.state})" for sensor in sensors])
         _LOGGER.debug("Sensors set up for entry ID %s: %s", config_entry.entry_id, sensor_info)
 
+    # Picked up by benchmarks/startup.py to track setup time regressions
+    _LOGGER.debug("Setup of entry %s took %.3f s", config_entry.entry_id, time.monotonic() - setup_start)
     return True
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -76,4 +246,12 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     unload_ok = await hass.config_entries.async_forward_entry_unload(config_entry, "sensor")
     if unload_ok:
         hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        async_release_token_manager(hass, config_entry)
+        # Stop any traffic recording once the last entry is gone
+        if not hass.data[DOMAIN]:
+            await async_stop_recording(hass)
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the snapshot cache when an entry is deleted."""
+    await SnapshotStore(hass, config_entry.entry_id).async_remove()
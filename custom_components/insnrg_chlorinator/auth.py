@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .cognito import async_refresh_tokens
+from .const import DOMAIN, TOKEN_REFRESH_MARGIN
+from .traffic import async_get_traffic_recorder
+
+_LOGGER = logging.getLogger(__name__)
+DATA_TOKEN_MANAGERS = f"{DOMAIN}_token_managers"
+
+def parse_expiry(value) -> datetime:
+    """Return the token expiry as a datetime, treating anything unreadable as already expired."""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        _LOGGER.error(f"Failed to convert expiry to datetime: {e}")
+        return datetime.min
+
+class TokenManager:
+    """Keeps the Cognito tokens of one INSNRG login fresh and persisted.
+
+    Every config entry of the same login shares one TokenManager (see
+    async_get_token_manager), so Cognito sees one refresh per account rather
+    than one per pool. Tokens are refreshed TOKEN_REFRESH_MARGIN ahead of
+    expiry, concurrent callers share a single refresh, and each new token set
+    is written back to every entry so a restart can pick up where it left off.
+    """
+
+    def __init__(self, hass: HomeAssistant, username):
+        self.hass = hass
+        self.username = username
+        self.access_token = None
+        self.id_token = None
+        self.refresh_token = None
+        self.expiry = datetime.min
+        self._entries = {}
+        self._lock = asyncio.Lock()
+
+    def add_entry(self, config_entry: ConfigEntry):
+        """Serve a config entry, adopting its stored tokens if they outlive the current ones."""
+        self._entries[config_entry.entry_id] = config_entry
+        expiry = parse_expiry(config_entry.data.get("expiry"))
+        if self.refresh_token is None or expiry > self.expiry:
+            self.access_token = config_entry.data.get("access_token")
+            self.id_token = config_entry.data.get("id_token")
+            self.refresh_token = config_entry.data.get("refresh_token")
+            self.expiry = expiry
+
+    def remove_entry(self, config_entry: ConfigEntry) -> bool:
+        """Stop serving a config entry. Returns True once no entries are left."""
+        self._entries.pop(config_entry.entry_id, None)
+        return not self._entries
+
+    def expires_soon(self) -> bool:
+        """Return True if the tokens are expired or inside the refresh margin."""
+        return self.expiry - TOKEN_REFRESH_MARGIN <= datetime.now()
+
+    async def async_ensure_valid(self):
+        """Refresh the tokens if they are about to expire. Raises CognitoError on rejection."""
+        if not self.expires_soon():
+            return
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not self.expires_soon():
+                return
+            await self._async_refresh()
+
+    async def _async_refresh(self):
+        _LOGGER.debug("Refreshing access token for %d entries", len(self._entries))
+        auth_result = await async_refresh_tokens(
+            async_get_clientsession(self.hass), self.refresh_token, recorder=async_get_traffic_recorder(self.hass)
+        )
+
+        self.access_token = auth_result['AccessToken']
+        self.expiry = timedelta(seconds=auth_result['ExpiresIn']) + datetime.now()
+        self.id_token = auth_result['IdToken']
+        # Refresh token remains the same, unless provided
+        if 'RefreshToken' in auth_result:
+            self.refresh_token = auth_result['RefreshToken']
+        _LOGGER.debug("Token refresh successful: New access token and expiry retrieved, valid until %s", self.expiry)
+
+        for config_entry in self._entries.values():
+            self.hass.config_entries.async_update_entry(
+                config_entry,
+                data={
+                    **config_entry.data,
+                    "access_token": self.access_token,
+                    "id_token": self.id_token,
+                    "refresh_token": self.refresh_token,
+                    "expiry": self.expiry.isoformat(),
+                },
+            )
+
+def _account_key(config_entry: ConfigEntry):
+    username = config_entry.data.get("Username")
+    # Cognito treats the email address as case-insensitive
+    return username.casefold() if username else config_entry.entry_id
+
+@callback
+def async_get_token_manager(hass: HomeAssistant, config_entry: ConfigEntry) -> TokenManager:
+    """Return the TokenManager shared by every entry of this entry's login, registering the entry with it."""
+    managers = hass.data.setdefault(DATA_TOKEN_MANAGERS, {})
+    key = _account_key(config_entry)
+    manager = managers.get(key)
+    if manager is None:
+        manager = managers[key] = TokenManager(hass, config_entry.data.get("Username"))
+    manager.add_entry(config_entry)
+    return manager
+
+@callback
+def async_release_token_manager(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Detach an entry from its login's TokenManager, dropping the manager with the last entry."""
+    managers = hass.data.get(DATA_TOKEN_MANAGERS, {})
+    key = _account_key(config_entry)
+    manager = managers.get(key)
+    if manager is not None and manager.remove_entry(config_entry):
+        managers.pop(key)
@@ -0,0 +1,53 @@
+import logging
+import json
+import time
+import aiohttp
+import async_timeout
+from .const import ClientId, COGNITO_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+class CognitoError(Exception):
+    """Error returned by the Cognito Identity Provider API."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+async def async_refresh_tokens(session: aiohttp.ClientSession, refresh_token, client_id=ClientId, endpoint=COGNITO_URL, recorder=None):
+    """Exchange a refresh token for new tokens with a REFRESH_TOKEN_AUTH InitiateAuth call.
+
+    Talks to Cognito's JSON API directly so refreshes don't need boto3. The
+    endpoint can be pointed at a local stub for testing, and a TrafficRecorder
+    can capture the exchange. Returns the AuthenticationResult dict, or
+    raises CognitoError.
+    """
+    headers = {
+        "Content-Type": "application/x-amz-json-1.1",
+        "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
+    }
+    body = {
+        "ClientId": client_id,
+        "AuthFlow": "REFRESH_TOKEN_AUTH",
+        "AuthParameters": {"REFRESH_TOKEN": refresh_token},
+    }
+
+    async with async_timeout.timeout(10):
+        start = time.monotonic()
+        # Cognito replies with application/x-amz-json-1.1, so the body is posted and read as raw JSON
+        async with session.post(endpoint, headers=headers, data=json.dumps(body)) as response:
+            status = response.status
+            data = await response.json(content_type=None)
+        latency = time.monotonic() - start
+
+    # Recorded outside the timeout, so a slow write can't fail the refresh
+    if recorder is not None:
+        await recorder.async_record("cognito", body, status, data, latency)
+    if status != 200:
+        # Error types look like "NotAuthorizedException" or "prefix#NotAuthorizedException"
+        code = str(data.get("__type", "UnknownError")).rsplit("#", 1)[-1]
+        raise CognitoError(code, data.get("message", data.get("Message", "")))
+
+    _LOGGER.debug("Cognito token refresh succeeded")
+    return data["AuthenticationResult"]
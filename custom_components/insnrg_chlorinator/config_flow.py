@@ -1,18 +1,34 @@
 import voluptuous as vol
 import logging
-import aiohttp
 import async_timeout
 import asyncio
-import boto3
+import json
+import time
 from datetime import datetime, timedelta
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN, ClientId, PoolId, API_SystemID_URL
-from pycognito import AWSSRP
-from botocore.exceptions import ClientError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .const import (
+    DOMAIN,
+    ClientId,
+    PoolId,
+    API_SystemID_URL,
+    CONF_TIMERS_INTERVAL,
+    CONF_TEMPERATURE_INTERVAL,
+    CONF_CHEMISTRY_INTERVAL,
+    DEFAULT_TIMERS_INTERVAL,
+    DEFAULT_TEMPERATURE_INTERVAL,
+    DEFAULT_CHEMISTRY_INTERVAL,
+    CONF_FILTER_WINDOW,
+    DEFAULT_FILTER_WINDOW,
+)
+from .traffic import async_get_traffic_recorder
 
 _LOGGER = logging.getLogger(__name__)
 
+class AuthenticationFailed(Exception):
+    """Cognito rejected the login."""
+
 @callback
 def configured_instances(hass):
     return {entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)}
@@ -20,6 +36,11 @@ def configured_instances(hass):
 class InsnrgChlorinatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return InsnrgChlorinatorOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
@@ -29,52 +50,60 @@ class InsnrgChlorinatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             def initiate_auth_sync(username, password):
                 """Synchronously perform USER_SRP_AUTH and process challenges."""
-                client = boto3.client('cognito-idp', region_name='us-east-2')
-
-                # Start SRP authentication
-                aws_srp = AWSSRP(
-                    username=username,
-                    password=password,
-                    pool_id=PoolId,
-                    client_id=ClientId,
-                    client=client
-                )
-                auth_params = aws_srp.get_auth_params()
-
-                # Initiate authentication
-                response = client.initiate_auth(
-                    ClientId=ClientId,
-                    AuthFlow='USER_SRP_AUTH',
-                    AuthParameters=auth_params
-                )
-                _LOGGER.debug("Received auth response")
-                #_LOGGER.debug("Auth response contents: %s", response)
-
-                if response.get('ChallengeName') == 'PASSWORD_VERIFIER':
-                    _LOGGER.debug("Processing password challenge")
-                    challenge_responses = aws_srp.process_challenge(
-                        response['ChallengeParameters'],
-                        auth_params
+                # Imported here so boto3, botocore and pycognito only load for interactive logins
+                import boto3
+                from botocore.exceptions import ClientError
+                from pycognito import AWSSRP
+
+                try:
+                    client = boto3.client('cognito-idp', region_name='us-east-2')
+
+                    # Start SRP authentication
+                    aws_srp = AWSSRP(
+                        username=username,
+                        password=password,
+                        pool_id=PoolId,
+                        client_id=ClientId,
+                        client=client
                     )
-                    #_LOGGER.debug("ChallengeParameters: %s", response['ChallengeParameters']) # This should include PASSWORD_CLAIM_SECRET_BLOCK, PASSWORD_CLAIM_SIGNATURE, TIMESTAMP, USERNAME (as a UUID)
+                    auth_params = aws_srp.get_auth_params()
 
-                    # Respond to password challenge
-                    response = client.respond_to_auth_challenge(
+                    # Initiate authentication
+                    response = client.initiate_auth(
                         ClientId=ClientId,
-                        ChallengeName='PASSWORD_VERIFIER',
-                        ChallengeResponses=challenge_responses
+                        AuthFlow='USER_SRP_AUTH',
+                        AuthParameters=auth_params
                     )
-                    #_LOGGER.debug("Challenge response received: %s", response)
-
-                # Extract tokens
-                auth_result = response['AuthenticationResult']
-                _LOGGER.debug("Authentication successful, tokens retrieved. Getting System ID")
-                return {
-                    "access_token": auth_result['AccessToken'],
-                    "expiry": timedelta(seconds=auth_result['ExpiresIn']) + datetime.now(),
-                    "id_token": auth_result['IdToken'],
-                    "refresh_token": auth_result['RefreshToken']
-                }
+                    _LOGGER.debug("Received auth response")
+                    #_LOGGER.debug("Auth response contents: %s", response)
+
+                    if response.get('ChallengeName') == 'PASSWORD_VERIFIER':
+                        _LOGGER.debug("Processing password challenge")
+                        challenge_responses = aws_srp.process_challenge(
+                            response['ChallengeParameters'],
+                            auth_params
+                        )
+                        #_LOGGER.debug("ChallengeParameters: %s", response['ChallengeParameters']) # This should include PASSWORD_CLAIM_SECRET_BLOCK, PASSWORD_CLAIM_SIGNATURE, TIMESTAMP, USERNAME (as a UUID)
+
+                        # Respond to password challenge
+                        response = client.respond_to_auth_challenge(
+                            ClientId=ClientId,
+                            ChallengeName='PASSWORD_VERIFIER',
+                            ChallengeResponses=challenge_responses
+                        )
+                        #_LOGGER.debug("Challenge response received: %s", response)
+
+                    # Extract tokens
+                    auth_result = response['AuthenticationResult']
+                    _LOGGER.debug("Authentication successful, tokens retrieved. Getting System ID")
+                    return {
+                        "access_token": auth_result['AccessToken'],
+                        "expiry": (timedelta(seconds=auth_result['ExpiresIn']) + datetime.now()).isoformat(),
+                        "id_token": auth_result['IdToken'],
+                        "refresh_token": auth_result['RefreshToken']
+                    }
+                except ClientError as e:
+                    raise AuthenticationFailed(str(e)) from e
 
             try:
                 # Run the synchronous authentication function in the executor
@@ -83,8 +112,8 @@ class InsnrgChlorinatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     initiate_auth_sync, username, password
                 )
 
-                # Use the id_token to retrieve the system ID asynchronously
-                system_id = await self._get_system_id(auth_result['id_token'])
+                # Use the id_token to retrieve every active system ID asynchronously
+                system_ids = await self._get_system_ids(auth_result['id_token'])
 
                 # Store tokens and additional data in the configuration entry
                 return self.async_create_entry(
@@ -92,10 +121,11 @@ class InsnrgChlorinatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data={
                         "Username": username,
                         **auth_result,
-                        "system_id": system_id,
+                        "system_id": system_ids[0] if system_ids else None,
+                        "systems": system_ids,
                     }
                 )
-            except ClientError as e:
+            except AuthenticationFailed as e:
                 _LOGGER.error(f"Authentication failed: {e}")
                 errors["base"] = "auth_failed"
             except Exception as e:
@@ -110,30 +140,73 @@ class InsnrgChlorinatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
-    async def _get_system_id(self, id_token):
+    async def _get_system_ids(self, id_token):
         headers = {
             "Authorization": f"Bearer {id_token}"
         }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with async_timeout.timeout(10):
-                    async with session.post(API_SystemID_URL, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            _LOGGER.debug("Obtaining SystemID")
-            
-                            # Check if the response contains the 'data' field and it's a list with at least one item
-                            if "data" in data and isinstance(data["data"], list):
-                                # Iterate through the items to find the first one with isActive == True
-                                for item in data["data"]:
-                                    if item.get("isActive"):
-                                        system_id = item.get("systemId")
-                                        _LOGGER.debug("Found active systemId: %s", system_id)
-                                        return system_id
-                            _LOGGER.warning("No systemId found in response data.")
-                            return None  # Return None if no systemId is found
-                        else:
-                            _LOGGER.error("Error fetching data from API: %s", await response.text())
-            except Exception as err:
-                _LOGGER.error(f"Exception during chlorinator SystemID retrieval: {err}")
+        system_ids = []
+        session = async_get_clientsession(self.hass)
+        try:
+            async with async_timeout.timeout(10):
+                start = time.monotonic()
+                async with session.post(API_SystemID_URL, headers=headers) as response:
+                    status = response.status
+                    raw = await response.read()
+                latency = time.monotonic() - start
+
+            # Recorded outside the timeout, so a slow write can't fail the lookup
+            recorder = async_get_traffic_recorder(self.hass)
+            if recorder is not None:
+                await recorder.async_record("system_ids", {}, status, raw, latency)
+            if status == 200:
+                data = json.loads(raw)
+                _LOGGER.debug("Obtaining SystemIDs")
+
+                # Check if the response contains the 'data' field and it's a list
+                if "data" in data and isinstance(data["data"], list):
+                    # Collect every item with isActive == True
+                    for item in data["data"]:
+                        if item.get("isActive"):
+                            system_id = item.get("systemId")
+                            _LOGGER.debug("Found active systemId: %s", system_id)
+                            system_ids.append(system_id)
+                if not system_ids:
+                    _LOGGER.warning("No systemId found in response data.")
+            else:
+                _LOGGER.error("Error fetching data from API: %s", raw.decode("utf-8", errors="replace"))
+        except Exception as err:
+            _LOGGER.error(f"Exception during chlorinator SystemID retrieval: {err}")
+        return system_ids
+
+class InsnrgChlorinatorOptionsFlow(config_entries.OptionsFlow):
+    """Lets the user tune how often each actionApi endpoint is read and how much the spike filter smooths."""
+
+    def __init__(self, config_entry):
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        minutes = vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60))
+        schema = vol.Schema({
+            vol.Required(
+                CONF_TIMERS_INTERVAL,
+                default=options.get(CONF_TIMERS_INTERVAL, int(DEFAULT_TIMERS_INTERVAL.total_seconds() // 60)),
+            ): minutes,
+            vol.Required(
+                CONF_TEMPERATURE_INTERVAL,
+                default=options.get(CONF_TEMPERATURE_INTERVAL, int(DEFAULT_TEMPERATURE_INTERVAL.total_seconds() // 60)),
+            ): minutes,
+            vol.Required(
+                CONF_CHEMISTRY_INTERVAL,
+                default=options.get(CONF_CHEMISTRY_INTERVAL, int(DEFAULT_CHEMISTRY_INTERVAL.total_seconds() // 60)),
+            ): minutes,
+            vol.Required(
+                CONF_FILTER_WINDOW,
+                default=options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=2, max=100)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
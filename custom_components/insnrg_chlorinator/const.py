@@ -1,5 +1,77 @@
+from datetime import timedelta
+
 DOMAIN = "insnrg_chlorinator"
 API_URL = "https://imnwf40hng.execute-api.us-east-2.amazonaws.com/prod/actionApi"
 API_SystemID_URL = "https://69lfsbfsrb.execute-api.us-east-2.amazonaws.com/prod/all"
 ClientId = "50kmkes69ij352vpq3ec7dfki2"
-PoolId = "us-east-2_qrnmEYVSG"
\ No newline at end of file
+PoolId = "us-east-2_qrnmEYVSG"
+COGNITO_URL = "https://cognito-idp.us-east-2.amazonaws.com/"
+
+# Refresh scheduling around chlorinator timer windows
+SCAN_INTERVAL = timedelta(hours=1)  # Longest gap between refreshes while chlorinating
+IDLE_SCAN_INTERVAL = timedelta(hours=3)  # Longest gap between refreshes outside timer windows
+TIMER_SETTLE_DELAY = timedelta(minutes=5)  # Let readings settle after a run starts
+TIMER_STOP_LEAD = timedelta(minutes=2)  # Refresh this long before a run stops
+MIN_REFRESH_INTERVAL = timedelta(minutes=1)
+# Entries' planned refreshes are spread over this window by their fleet phase; kept under TIMER_STOP_LEAD
+REFRESH_STAGGER_WINDOW = timedelta(seconds=90)
+
+# Per-endpoint refresh intervals, configurable in the integration options (minutes)
+CONF_TIMERS_INTERVAL = "timers_interval"
+CONF_TEMPERATURE_INTERVAL = "temperature_interval"
+CONF_CHEMISTRY_INTERVAL = "chemistry_interval"
+DEFAULT_TIMERS_INTERVAL = timedelta(hours=12)  # Timers hardly ever change
+DEFAULT_TEMPERATURE_INTERVAL = IDLE_SCAN_INTERVAL
+DEFAULT_CHEMISTRY_INTERVAL = SCAN_INTERVAL  # Only fetched while chlorinating
+ENDPOINT_RETRY_INTERVAL = timedelta(minutes=10)  # Retry a failed endpoint after this long
+
+# Cap on actionApi requests in flight at once for one account
+MAX_CONCURRENT_REQUESTS = 4
+
+# Refresh Cognito tokens this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Seconds to wait before writing the snapshot cache, so bursts of refreshes share one write
+SNAPSHOT_SAVE_DELAY = 10
+
+# Rolling pH, ORP and temperature history kept per system
+HISTORY_CAPACITY = 512  # samples per series
+HISTORY_WINDOW = timedelta(hours=24)
+
+# Spike filter for chemistry readings
+CONF_FILTER_WINDOW = "filter_window"
+DEFAULT_FILTER_WINDOW = 10  # samples; sets how quickly the filter's baseline follows the readings
+FILTER_THRESHOLD = 4.0  # reject readings this many mean absolute deviations from the baseline
+FILTER_WARMUP = 3  # samples accepted unchecked while the baseline forms
+FILTER_MAX_CONSECUTIVE_REJECTS = 3  # after this many rejections in a row, accept the new level as real
+
+# Retries and circuit breaker for actionApi
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0  # seconds
+RETRY_MAX_DELAY = 10.0  # seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = timedelta(minutes=5)
+BREAKER_MAX_RESET_TIMEOUT = timedelta(hours=1)
+
+# Fleet mode: limits shared by every config entry, since they all call the same API
+FLEET_REQUEST_RATE = 5.0  # actionApi requests per second, on average
+FLEET_REQUEST_BURST = 10  # requests allowed at once after a quiet period
+FLEET_MAX_CONCURRENT_REQUESTS = 16
+
+# Services
+SERVICE_REFRESH = "refresh"
+ATTR_SECTIONS = "sections"
+ATTR_ENTRY_ID = "entry_id"
+REFRESH_SECTIONS = ("timers", "temperature", "chemistry")
+SERVICE_EXPORT_HISTORY = "export_history"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_SYSTEM_ID = "system_id"
+ATTR_FILENAME = "filename"
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+EXPORT_DIRECTORY = "insnrg_chlorinator_exports"  # under the config directory
+EXPORT_CHUNK_SIZE = 1000  # samples handed to the executor per write
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+ATTR_DURATION = "duration"
+DEFAULT_RECORDING_DURATION = 60  # minutes
@@ -2,277 +2,554 @@ import logging
 import aiohttp
 import asyncio
 import async_timeout
-import boto3
-import json
+import time
+from dataclasses import replace
+from types import MappingProxyType
 from datetime import datetime, timedelta
-from botocore.exceptions import ClientError
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN, ClientId
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .const import (
+    DOMAIN,
+    SCAN_INTERVAL,
+    MIN_REFRESH_INTERVAL,
+    REFRESH_STAGGER_WINDOW,
+    MAX_CONCURRENT_REQUESTS,
+    RETRY_ATTEMPTS,
+    DEFAULT_TIMERS_INTERVAL,
+    DEFAULT_TEMPERATURE_INTERVAL,
+    DEFAULT_CHEMISTRY_INTERVAL,
+    DEFAULT_FILTER_WINDOW,
+)
+from .auth import TokenManager
+from .cognito import CognitoError
+from .store import SnapshotStore
+from .snapshot import SystemSnapshot, diff_snapshots, parse_chemistry
+from .scheduler import next_refresh_interval
+from .timer_index import TimerIndex
+from .decoding import decode_chemistry, decode_temperature, decode_timers
+from .endpoints import ENDPOINT_PARAMS, UNCHANGED, EndpointState
+from .history import ChemistryHistory
+from .filter import chemistry_filters
+from .statistics import StatisticsImporter
+from .fleet import async_get_fleet
+from .resilience import CircuitOpenError, TransientError, async_get_breaker, backoff_delay
+from .traffic import async_get_traffic_recorder
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(hours=1)
+DEFAULT_INTERVALS = {
+    "timers": DEFAULT_TIMERS_INTERVAL,
+    "temperature": DEFAULT_TEMPERATURE_INTERVAL,
+    "chemistry": DEFAULT_CHEMISTRY_INTERVAL,
+}
+# Chemistry readings kept in the rolling history, by history series
+HISTORY_CHEMISTRY_KEYS = {"ph": "currentPh", "orp": "currentORP"}
+
+class InsnrgSystem:
+    """State kept between refreshes for one chlorinator system on the account."""
+
+    def __init__(self, system_id, intervals, filter_window=DEFAULT_FILTER_WINDOW):
+        self.system_id = system_id
+        self.timers = None
+        self.temperature = None
+        self.chemistry = None
+        self.chemistry_updated = None
+        self.was_chlorinating = False
+        self.timer_index = TimerIndex()
+        self.request_timings = {}
+        self.endpoints = {name: EndpointState(name, interval) for name, interval in intervals.items()}
+        self.history = ChemistryHistory()
+        self.statistics = None  # StatisticsImporter, set by the coordinator
+        self.filters = chemistry_filters(filter_window)
+        self.accepted_keys = frozenset()  # Chemistry keys that passed the filters in the last parsed response
+
+    async def timed(self, name, coro):
+        """Await a request and record how long it took in request_timings."""
+        start = time.monotonic()
+        try:
+            return await coro
+        finally:
+            self.request_timings[name] = round(time.monotonic() - start, 3)
 
 class InsnrgChlorinatorCoordinator(DataUpdateCoordinator):
-    """Coordinator to manage data updates."""
+    """Coordinator to manage data updates for every system on one account."""
     _LOGGER.debug("Setting up INSNRG Coordinator")
 
-    def __init__(self, hass: HomeAssistant, api_url, system_id, token, expiry, refresh_token, id_token):
+    def __init__(self, hass: HomeAssistant, api_url, system_ids, tokens: TokenManager, store: SnapshotStore | None = None, intervals=None, filter_window=DEFAULT_FILTER_WINDOW, phase=timedelta(0)):
         """Initialize the coordinator."""
-        super().__init__(hass, _LOGGER, name = DOMAIN, update_interval = SCAN_INTERVAL) 
+        # Listeners are only notified when a snapshot actually differs from the last one
+        super().__init__(hass, _LOGGER, name = DOMAIN, update_interval = SCAN_INTERVAL, always_update = False) 
         self.api_url = api_url
-        self.system_id = system_id
-        self.token = token
-        self.expiry = expiry
-        self.refresh_token = refresh_token
-        self.id_token = id_token
-        self.last_pool_chemistry = None
-        self.updated = datetime.now().isoformat()
+        self.tokens = tokens
+        self.store = store
+        intervals = {**DEFAULT_INTERVALS, **(intervals or {})}
+        self.systems = {system_id: InsnrgSystem(system_id, intervals, filter_window) for system_id in system_ids}
+        for system_id, system in self.systems.items():
+            system.statistics = StatisticsImporter(hass, system_id)
+        # The first system keeps the entity IDs from before multi-system support
+        self.primary_system_id = system_ids[0] if system_ids else None
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Keys that changed in the last refresh, per system. A missing system means update everything.
+        self.changed_keys = {}
+        self._needs_save = False  # History or statistics progress not written to the store yet
+        # Entries sharing a timer boundary would otherwise all refresh at the same moment after it
+        self._refresh_shift = REFRESH_STAGGER_WINDOW * (phase / SCAN_INTERVAL)
 
     async def _async_update_data(self):
-        """Fetch data from the API and return it."""
-        # Check if token has expired, if so, refresh it
-        if self._token_expired():
-            await self._refresh_token()
-
-        pool_chemistry = None
-        # Step 1: Update timers
-        _LOGGER.debug("Updating timers.")
-        timers = await self._get_timers()
-    
-        if timers:
-            # Step 2: Check for active timers where chlorinator == True
-            current_time = datetime.now().strftime("%H:%M")
-            active_timer_found = False
-    
-            for timer in timers:
-                start_time = timer.get("start_time")
-                stop_time = timer.get("stop_time")
-                chlorinator = timer.get("chlorinator", 0)
-                enabled = timer.get("enabled", 0)
-                if enabled and chlorinator and start_time <= current_time <= stop_time:
-                    _LOGGER.debug(f"Active timer found: Timer {timer['timer_number']} from {start_time} to {stop_time}.")
-                    active_timer_found = True
-                    break
-
-        pool_chemistry = await self._get_chemistry()
-
-        # Step 4: Update temperature
-        _LOGGER.debug("Updating pool temperature.")
-        temperature = await self._get_temp()
-        if not temperature:
-            _LOGGER.info("Failed to retrieve temperature data or your reading is 0 degrees.") 
-        else:
-            _LOGGER.debug("Retrieved Temp: %s", temperature)
+        """Fetch data for every system from the API and return a SystemSnapshot per system ID."""
+        # Until this refresh succeeds, listeners should treat everything as changed
+        self.changed_keys = {}
 
-        # Bundle and return all data: timers, temperature, and pool chemistry
-        if active_timer_found:
-            _LOGGER.info("The chlorinator is on. Using current chemistry.")
-            self.last_pool_chemistry = pool_chemistry
-            return {
-                "timers": timers,
-                "temperature": temperature,
-                "pool_chemistry": pool_chemistry
-            }
-        elif self.last_pool_chemistry:
-            _LOGGER.warning("Using last known pool_chemistry, as the chlorinator is off and current readings may be inaccurate.")
-            return {
-                "timers": timers,
-                "temperature": temperature,
-                "pool_chemistry": self.last_pool_chemistry
-            }
-        else:
-            _LOGGER.warning("Not updating pool_chemistry, as the chlorinator is off and may be inaccurate. No previous data available")
-            return {
-                "timers": timers,
-                "temperature": temperature,
-                "pool_chemistry": None
-            }
-
-    def _token_expired(self):
-        """Check if the token has expired."""
-
-        # If expiry is a string, convert it to a datetime object 
-        if isinstance(self.expiry, str):
-            try:
-                expiry_datetime = datetime.strptime(self.expiry, "%Y-%m-%dT%H:%M:%S.%f")
-                _LOGGER.debug("Converted expiry from string to datetime: %s", expiry_datetime)
-            except ValueError as e:
-                _LOGGER.error(f"Failed to convert expiry string to datetime: {e}")
-                return True  # Handle error by treating token as expired
-        else:
-            expiry_datetime = self.expiry
-
-        if expiry_datetime < datetime.now():
-            _LOGGER.debug("Token has expired")
-            return True
-        else:
-            _LOGGER.debug("Token is alive")
-            return False
-
-
-    async def _refresh_token(self):
-        """Use the refresh token to get a new access token."""
-        _LOGGER.debug("Refreshing access token")
-
-        def refresh_token_sync():
-            """Synchronously refresh the token in an executor."""
-            client = boto3.client('cognito-idp', region_name='us-east-2')
-            response = client.initiate_auth(
-                ClientId=ClientId,
-                AuthFlow='REFRESH_TOKEN_AUTH',
-                AuthParameters={'REFRESH_TOKEN': self.refresh_token}
+        try:
+            # Refresh the tokens ahead of expiry
+            await self._ensure_token()
+
+            results = await asyncio.gather(*(self._update_system(system) for system in self.systems.values()))
+        except UpdateFailed as err:
+            if not self.data:
+                raise
+            # Keep serving the last good data, flagged as stale, while the API is unhealthy
+            _LOGGER.warning(f"Serving cached data, the INSNRG API is unavailable: {err}")
+            breaker = async_get_breaker(self.hass)
+            if breaker.is_open:
+                # Come back when the circuit breaker will let a probe through
+                self.update_interval = max(timedelta(seconds=breaker.retry_after()), MIN_REFRESH_INTERVAL)
+            return self._publish({system_id: replace(snapshot, stale=True) for system_id, snapshot in self.data.items()})
+        snapshots = dict(zip(self.systems, results))
+
+        # Plan the next refresh around the earliest timer boundary or endpoint due time of any system
+        now = datetime.now()
+        self.update_interval = min(
+            (self._next_refresh(system, now) for system in self.systems.values()),
+            default=SCAN_INTERVAL,
+        ) + self._refresh_shift
+        breaker = async_get_breaker(self.hass)
+        if breaker.is_open:
+            self.update_interval = max(timedelta(seconds=breaker.retry_after()), self.update_interval)
+
+        snapshots = self._publish(snapshots)
+        _LOGGER.debug("Fleet request queue: %s", async_get_fleet(self.hass).stats())
+
+        # Hand finished hours of history to the recorder as long-term statistics
+        for system in self.systems.values():
+            if system.statistics.async_import(system.history, now):
+                self._needs_save = True
+
+        # Keep the last good data on disk so the next startup doesn't wait for the cloud
+        if self.store is not None and (self._needs_save or any(keys is None or keys for keys in self.changed_keys.values())):
+            self._async_save(snapshots)
+            self._needs_save = False
+
+        return snapshots
+
+    @callback
+    def _async_save(self, snapshots):
+        self.store.async_save(
+            snapshots,
+            {system_id: system.history for system_id, system in self.systems.items()},
+            {system_id: system.statistics for system_id, system in self.systems.items()},
+        )
+
+    def _publish(self, snapshots):
+        """Work out which values changed so entities with unchanged values skip their state writes."""
+        previous = self.data or {}
+        self.changed_keys = {
+            system_id: diff_snapshots(previous.get(system_id), snapshot)
+            for system_id, snapshot in snapshots.items()
+        }
+        _LOGGER.debug("Changed keys: %s", self.changed_keys)
+        return snapshots
+
+    def _next_refresh(self, system: InsnrgSystem, now):
+        """Return how long until this system next needs a refresh."""
+        # Chemistry is only read while chlorinating, so its interval sets the cadence inside timer windows
+        interval = next_refresh_interval(system.timer_index, now, active_interval=system.endpoints["chemistry"].interval)
+        names = ["timers", "temperature"]
+        if system.was_chlorinating or system.timer_index.is_active(now):
+            # Chemistry keeps its own schedule, including retries, while a run is on or its last read is pending
+            names.append("chemistry")
+        for name in names:
+            interval = min(interval, system.endpoints[name].due_in(now))
+        return max(interval, MIN_REFRESH_INTERVAL)
+
+    @callback
+    def async_set_intervals(self, intervals):
+        """Apply new per-endpoint refresh intervals; they take effect from each endpoint's next fetch."""
+        for system in self.systems.values():
+            for name, interval in intervals.items():
+                system.endpoints[name].interval = interval
+
+    async def async_request_sections(self, sections):
+        """Mark endpoints as due and request a debounced refresh.
+
+        Requests made while a refresh is running, or within the debouncer's
+        cooldown, are served by one more refresh rather than one each.
+        """
+        for system in self.systems.values():
+            for name in sections:
+                system.endpoints[name].next_due = None
+        await self.async_request_refresh()
+
+    @callback
+    def async_set_filter_window(self, window):
+        """Change how many readings the spike filters' baselines average over."""
+        for system in self.systems.values():
+            for spike_filter in system.filters.values():
+                spike_filter.window = window
+
+    @callback
+    def async_restore(self, snapshots, history=None, statistics=None):
+        """Serve cached snapshots until the first refresh completes (stale-while-revalidate)."""
+        # Cached system IDs come back from JSON as strings
+        cached = {str(system_id): snapshot for system_id, snapshot in snapshots.items()}
+        history = history or {}
+        statistics = statistics or {}
+        now = datetime.now()
+        data = {}
+        for system_id, system in self.systems.items():
+            system.history.load(history.get(str(system_id)))
+            system.statistics.load(statistics.get(str(system_id)))
+            # Backfill statistics from cached samples before they age out of the window
+            if system.statistics.async_import(system.history, now):
+                self._needs_save = True
+            system.history.expire(now)
+            # Give the spike filters a baseline from readings that already passed them
+            for name, key in HISTORY_CHEMISTRY_KEYS.items():
+                for _, value in system.history.series[name].samples():
+                    system.filters[key].accept(value)
+            snapshot = cached.get(str(system_id)) or SystemSnapshot(updated=now)
+            system.timer_index = TimerIndex(snapshot.timers)
+            snapshot = replace(
+                snapshot,
+                chlorinating_minutes=system.timer_index.total_minutes,
+                next_change=system.timer_index.next_transition(now),
+                history=system.history.stats(),
+                rejected=self._rejected_counts(system),
             )
-            return response
+            system.timers = list(snapshot.timers) or None
+            system.temperature = snapshot.temperature
+            system.chemistry = snapshot.chemistry
+            system.chemistry_updated = snapshot.chemistry_updated
+            system.was_chlorinating = snapshot.chlorinating
+            data[system_id] = snapshot
+        self.data = data
+
+    def has_changed(self, system_id, key) -> bool:
+        """Return True if the entity for this system and key needs a state write after the last refresh."""
+        changed = self.changed_keys.get(system_id)
+        return changed is None or key in changed
+
+    async def _update_system(self, system: InsnrgSystem):
+        """Fetch whichever endpoints are due for one system and merge them with the latest results of the rest.
+
+        A failing endpoint keeps its previous result and is retried on its own,
+        without discarding what the other endpoints returned.
+        """
+        now = datetime.now()
+        system.request_timings = {}
+
+        # Step 1: Fetch timers and temperature concurrently, if their intervals have passed
+        fetches = {}
+        if system.endpoints["timers"].is_due(now):
+            fetches["timers"] = self._get_timers(system)
+        if system.endpoints["temperature"].is_due(now):
+            fetches["temperature"] = self._get_temp(system)
+        _LOGGER.debug("Updating %s for system %s.", ", ".join(fetches) or "nothing", system.system_id)
+        results = await asyncio.gather(
+            *(system.timed(name, fetch) for name, fetch in fetches.items()),
+            return_exceptions=True,
+        )
+        for name, result in zip(fetches, results):
+            if isinstance(result, UpdateFailed):
+                system.endpoints[name].record_error(now, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            system.endpoints[name].record_success(now)
+            if result is UNCHANGED:
+                _LOGGER.debug("%s response unchanged for system %s.", name.capitalize(), system.system_id)
+            elif name == "timers":
+                system.timers = result
+                # Index the chlorinator timer windows
+                system.timer_index = TimerIndex(result)
+            else:
+                system.temperature = result
+                if not result:
+                    _LOGGER.info("Failed to retrieve temperature data or your reading is 0 degrees.") 
+                else:
+                    _LOGGER.debug("Retrieved Temp: %s", result)
 
-        try:
-            # Run the synchronous function in Home Assistant’s executor
-            response = await self.hass.async_add_executor_job(refresh_token_sync)
+        if "temperature" in fetches and system.endpoints["temperature"].last_error is None and system.temperature:
+            self._record_sample(system, "temperature", now, system.temperature)
 
-            #_LOGGER.debug("Token refresh response received: %s", response)
+        # Step 2: Check whether a chlorinator timer window is active
+        active_timer_found = system.timer_index.is_active(now)
+        if active_timer_found:
+            _LOGGER.debug("Active chlorinator timer window, next change at %s.", system.timer_index.next_transition(now))
 
-            # Extract new tokens from the response
-            auth_result = response['AuthenticationResult']
-            self.token = auth_result['AccessToken']
-            self.expiry = timedelta(seconds=auth_result['ExpiresIn']) + datetime.now()
-            self.id_token = auth_result['IdToken']
+        # Step 3: Only ask for chemistry while chlorinating, plus once more when a run has just ended
+        chemistry = system.endpoints["chemistry"]
+        stop = system.timer_index.next_transition(now) if active_timer_found else None
+        try:
+            # Read early when the run stops before chemistry is next due, so the run's last reading isn't missed
+            if active_timer_found and (chemistry.is_due(now) or (stop is not None and chemistry.next_due >= stop)):
+                _LOGGER.info("The chlorinator is on. Using current chemistry.")
+                await self._update_chemistry(system)
+            elif active_timer_found:
+                _LOGGER.debug("The chlorinator is on, chemistry is next due at %s.", chemistry.next_due)
+            elif system.was_chlorinating:
+                _LOGGER.info("The chlorinator has just turned off. Capturing the last chemistry reading of the run.")
+                await self._update_chemistry(system)
+            elif system.chemistry:
+                _LOGGER.debug("Using last known pool_chemistry, as the chlorinator is off and current readings may be inaccurate.")
+            else:
+                _LOGGER.warning("Not updating pool_chemistry, as the chlorinator is off and may be inaccurate. No previous data available")
+        except UpdateFailed as err:
+            system.endpoints["chemistry"].record_error(now, err)
+            # Keep the flag if the post-run read failed, so it is retried on the next refresh
+            system.was_chlorinating = system.was_chlorinating or active_timer_found
+        else:
+            system.was_chlorinating = active_timer_found
+        _LOGGER.debug("Request timings for system %s (s): %s", system.system_id, system.request_timings)
+        _LOGGER.debug(
+            "Unchanged response hits/misses for system %s: %s",
+            system.system_id,
+            {name: (endpoint.hits, endpoint.misses) for name, endpoint in system.endpoints.items()},
+        )
+
+        system.history.expire(now)
+        errors = tuple(name for name, endpoint in system.endpoints.items() if endpoint.last_error)
+        if errors and self.data is None:
+            # Nothing to fall back on yet, so let setup retry later
+            raise UpdateFailed(f"Could not fetch {', '.join(errors)} for system {system.system_id}")
+
+        # Bundle the latest result of every endpoint into one snapshot
+        return SystemSnapshot(
+            updated=now,
+            timers=tuple(system.timers or ()),
+            temperature=system.temperature,
+            chlorinating=active_timer_found,
+            chlorinating_minutes=system.timer_index.total_minutes,
+            next_change=system.timer_index.next_transition(now),
+            chemistry=system.chemistry,
+            chemistry_updated=system.chemistry_updated,
+            stale=bool(errors),
+            errors=errors,
+            history=system.history.stats(),
+            rejected=self._rejected_counts(system),
+        )
+
+    async def _update_chemistry(self, system: InsnrgSystem):
+        """Fetch and parse chemistry for one system."""
+        pool_chemistry = await system.timed("chemistry", self._get_chemistry(system))
+        if pool_chemistry is not UNCHANGED:
+            rejected = sum(spike_filter.rejected for spike_filter in system.filters.values())
+            system.chemistry, system.accepted_keys = self._filter_chemistry(system, parse_chemistry(pool_chemistry))
+            if sum(spike_filter.rejected for spike_filter in system.filters.values()) > rejected:
+                # The same body must reach the filters again, or a persistent jump could never be accepted as real
+                system.endpoints["chemistry"].discard_fingerprint()
+        # An unchanged response still confirms the readings are current
+        system.chemistry_updated = datetime.now()
+        system.endpoints["chemistry"].record_success(system.chemistry_updated)
+
+        for name, key in HISTORY_CHEMISTRY_KEYS.items():
+            # Bounded readings like "< 300" only give a limit, not a value to average
+            if key in system.accepted_keys and system.chemistry[key].comparator is None:
+                self._record_sample(system, name, system.chemistry_updated, system.chemistry[key].value)
+
+    def _filter_chemistry(self, system: InsnrgSystem, chemistry):
+        """Run new readings through the spike filters, keeping the previous reading in place of a rejected one.
+
+        Returns the filtered chemistry and the keys whose new readings were accepted.
+        """
+        readings = dict(chemistry)
+        accepted = set()
+        for key, spike_filter in system.filters.items():
+            reading = readings.get(key)
+            if reading is None or not reading.valid:
+                continue
+            if spike_filter.accept(reading.value):
+                accepted.add(key)
+                continue
+            _LOGGER.info(f"Ignoring implausible {key} reading {reading.raw!r} for system {system.system_id}.")
+            previous = system.chemistry.get(key) if system.chemistry else None
+            if previous is not None:
+                readings[key] = previous
+            else:
+                readings.pop(key)
+        return MappingProxyType(readings), frozenset(accepted)
 
-                # Refresh token remains the same, unless provided
-            if 'RefreshToken' in auth_result:
-                self.refresh_token = auth_result['RefreshToken']
+    @staticmethod
+    def _rejected_counts(system: InsnrgSystem):
+        return MappingProxyType({key: spike_filter.rejected for key, spike_filter in system.filters.items()})
 
-            _LOGGER.debug("Token refresh successful: New access token and expiry retrieved")
+    def _record_sample(self, system: InsnrgSystem, name, when, value):
+        try:
+            system.history.add(name, when, value)
+        except (TypeError, ValueError):
+            _LOGGER.debug(f"Not adding non-numeric {name} value {value!r} to the history")
+            return
+        self._needs_save = True
+
+    async def _ensure_token(self):
+        """Make sure the access token is valid, refreshing it ahead of expiry."""
+        try:
+            await self.tokens.async_ensure_valid()
 
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code in ('NotAuthorizedException', 'InvalidRefreshTokenException'):
+        except CognitoError as e:
+            if e.code in ('NotAuthorizedException', 'InvalidRefreshTokenException'):
                 _LOGGER.error("Refresh token expired or invalid, prompting user for reauthentication.")
 #               Consider failure messages and handle to prompt credential check instead of UpdateFailed.
 #                raise ConfigEntryAuthFailed("Could not log in, please check your email and password.") from e
                 raise UpdateFailed("Refresh token invalid or expired. Reauthentication required.")
             else:
-                _LOGGER.error(f"ClientError during token refresh: {e}")
+                _LOGGER.error(f"Cognito error during token refresh: {e}")
                 raise UpdateFailed(f"Error refreshing token: {e}")
     
         except Exception as e:
             _LOGGER.error(f"Unexpected error during token refresh: {e}")
             raise UpdateFailed(f"Unexpected error refreshing token: {e}")
 
-    async def _get_timers(self):
-        
-        headers = {
-            "Authorization": f"Bearer {self.id_token}",
-        }
-        body = {
-            "systemId": self.system_id,
-            "params": "SetTimerAppliance",
-            "action": "view"
-        }
+    async def _async_post_action(self, system: InsnrgSystem, params):
+        """POST a view action for one system to actionApi, retrying transient failures with jittered backoff."""
+        breaker = async_get_breaker(self.hass)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"actionApi is unavailable, next attempt in {breaker.retry_after():.0f} s")
+        # A request let through an open breaker is its half-open probe
+        probing = breaker.is_open
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with async_timeout.timeout(10):
-                    async with session.post(self.api_url, headers=headers, json=body) as response:
-                        if response.status == 200:
-                            data = await response.json()
-
-                            # Extract timers
-                            timers = data.get("timers", [])
-                            if not timers:
-                                _LOGGER.warning("No timers found")
-                                return None
-
-                            timer_data = []
-                            for timer in timers:
-                                timer_number = timer.get("timerNumber", None)
-                                start_time = timer.get("start", None)
-                                stop_time = timer.get("stop", None)
-                                chlorinator = timer.get("chlorinator", None)
-                                enabled = timer.get("enable", None)
-
-                                timer_info = {
-                                    "timer_number": timer_number,
-                                    "start_time": start_time,
-                                    "stop_time": stop_time,
-                                    "chlorinator": chlorinator == 1,
-                                    "enabled": enabled == 1
-                                }
-                                timer_data.append(timer_info)
-
-                                _LOGGER.debug(f"Timer {timer_number} - Start: {start_time}, Stop: {stop_time}, Chlorinator: {chlorinator}, Enabled: {enabled}")
-
-                            return timer_data
-                        else:
-                            _LOGGER.error(f"Error fetching timers from API: {await response.text()}")
-                            raise UpdateFailed(f"Error {response.status} from API")
-            except Exception as err:
-                _LOGGER.error(f"Exception during timers update: {err}")
-                raise UpdateFailed(f"Update error: {err}")
-
-    async def _get_temp(self):
-        
+        try:
+            attempt = 0
+            while True:
+                try:
+                    data = await self._async_request(system, params)
+                except TransientError as err:
+                    attempt += 1
+                    # Don't retry a half-open probe, one request is all the API gets
+                    if attempt >= RETRY_ATTEMPTS or breaker.is_open:
+                        raise
+                    delay = backoff_delay(attempt - 1)
+                    _LOGGER.debug(f"{params} request failed ({err}), retrying in {delay:.1f} s")
+                    await asyncio.sleep(delay)
+                else:
+                    breaker.record_success()
+                    return data
+        except UpdateFailed:
+            # A 4xx response: the API answered, so it is up even though this request was refused
+            breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            # Unloads and shutdowns cancel requests in flight, which says nothing about the API
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+        finally:
+            # Whatever happened, a half-open probe must not stay outstanding or the breaker never closes
+            if probing:
+                breaker.end_probe()
+
+    async def _async_request(self, system: InsnrgSystem, params):
+        """Make a single actionApi request and return the raw response body."""
         headers = {
-            "Authorization": f"Bearer {self.id_token}",
+            "Authorization": f"Bearer {self.tokens.id_token}",
         }
         body = {
-            "systemId": self.system_id,
-            "params": "DashboardScreen",
+            "systemId": system.system_id,
+            "params": params,
             "action": "view"
         }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with async_timeout.timeout(10):
-                    async with session.post(self.api_url, headers=headers, json=body) as response:
-                        if response.status == 200:
-                            data = await response.json()
-
-                            # Extract temp from liveData in system
-                            system_data = data.get("system", {})
-                            live_data = system_data.get("liveData", "{}")
-                            live_data_json = json.loads(live_data)
-                            temp = live_data_json.get("temp", None)
-
-                            if temp is not None:
-                                _LOGGER.debug(f"Temperature from system liveData: {temp}")
-                                return temp
-                            else:
-                                _LOGGER.warning("Temperature not found in liveData")
-                                return 0
-                        else:
-                            _LOGGER.error(f"Error fetching temperature from API: {await response.text()}")
-                            raise UpdateFailed(f"Error {response.status} from API")
-            except Exception as err:
-                _LOGGER.error(f"Exception during temperature update: {err}")
-                raise UpdateFailed(f"Update error: {err}")
-
-    async def _get_chemistry(self):
-        
-        headers = {
-            "Authorization": f"Bearer {self.id_token}",
-        }
-        body = {
-            "systemId": self.system_id,
-            "params": "ChemistryScreen",
-            "action": "view"
-        }
+        session = async_get_clientsession(self.hass)
+        try:
+            # The fleet slot is taken outside the timeout, so time spent queueing doesn't count against the request
+            async with self._request_semaphore, async_get_fleet(self.hass).slot(), async_timeout.timeout(10):
+                start = time.monotonic()
+                async with session.post(self.api_url, headers=headers, json=body) as response:
+                    status = response.status
+                    data = await response.read()
+                latency = time.monotonic() - start
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as err:
+            raise TransientError(f"{type(err).__name__} {err}") from err
+
+        # Recorded once the slots are released, so writing the recording doesn't hold up other requests
+        recorder = async_get_traffic_recorder(self.hass)
+        if recorder is not None:
+            await recorder.async_record("action", body, status, data, latency)
+        if status == 200:
+            return data
+        text = data.decode("utf-8", errors="replace")
+        if status == 429 or status >= 500:
+            raise TransientError(f"Error {status} from API: {text}")
+        raise UpdateFailed(f"Error {status} from API: {text}")
+
+    async def _get_timers(self, system: InsnrgSystem):
+        try:
+            body = await self._async_post_action(system, ENDPOINT_PARAMS["timers"])
+            if system.endpoints["timers"].is_unchanged(body):
+                return UNCHANGED
+            # Extract timers
+            timers = decode_timers(body)
+        except Exception as err:
+            _LOGGER.error(f"Exception during timers update: {err}")
+            raise UpdateFailed(f"Update error: {err}")
+
+        if not timers:
+            _LOGGER.warning("No timers found")
+            return None
+
+        timer_data = []
+        for timer in timers:
+            timer_number = timer.get("timerNumber", None)
+            start_time = timer.get("start", None)
+            stop_time = timer.get("stop", None)
+            chlorinator = timer.get("chlorinator", None)
+            enabled = timer.get("enable", None)
+
+            timer_info = {
+                "timer_number": timer_number,
+                "start_time": start_time,
+                "stop_time": stop_time,
+                "chlorinator": chlorinator == 1,
+                "enabled": enabled == 1
+            }
+            timer_data.append(timer_info)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with async_timeout.timeout(10):
-                    async with session.post(self.api_url, headers=headers, json=body) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            self.updated = datetime.now().isoformat()
-                            _LOGGER.debug("Chemistry data gathered")
-                            return data.get("poolChemistry", {})
-                        else:
-                            _LOGGER.error("Error fetching data from API: %s", await response.text())
-                            raise UpdateFailed(f"Error {response.status} from API")
-#            # Ideally, raise the ConfigEntryAuthFailed exception, possibly as below
-#            except ClientError as e:
-#                raise ConfigEntryAuthFailed("Could not log in, please check your email and password.") from e
-            except Exception as err:
-                _LOGGER.error(f"Exception during chlorinator sensor update: {err}")
-                raise UpdateFailed(f"Update error: {err}")
+            _LOGGER.debug(f"Timer {timer_number} - Start: {start_time}, Stop: {stop_time}, Chlorinator: {chlorinator}, Enabled: {enabled}")
+
+        return timer_data
+
+    async def _get_temp(self, system: InsnrgSystem):
+        try:
+            body = await self._async_post_action(system, ENDPOINT_PARAMS["temperature"])
+            if system.endpoints["temperature"].is_unchanged(body):
+                return UNCHANGED
+            # Extract temp from liveData in system
+            temp = decode_temperature(body)
+        except Exception as err:
+            _LOGGER.error(f"Exception during temperature update: {err}")
+            raise UpdateFailed(f"Update error: {err}")
+
+        if temp is not None:
+            _LOGGER.debug(f"Temperature from system liveData: {temp}")
+            return temp
+        else:
+            _LOGGER.warning("Temperature not found in liveData")
+            return 0
+
+    async def _get_chemistry(self, system: InsnrgSystem):
+        try:
+            body = await self._async_post_action(system, ENDPOINT_PARAMS["chemistry"])
+            if system.endpoints["chemistry"].is_unchanged(body):
+                return UNCHANGED
+            pool_chemistry = decode_chemistry(body)
+#        # Ideally, raise the ConfigEntryAuthFailed exception, possibly as below
+#        except ClientError as e:
+#            raise ConfigEntryAuthFailed("Could not log in, please check your email and password.") from e
+        except Exception as err:
+            _LOGGER.error(f"Exception during chlorinator sensor update: {err}")
+            raise UpdateFailed(f"Update error: {err}")
+
+        _LOGGER.debug("Chemistry data gathered")
+        return pool_chemistry
@@ -0,0 +1,50 @@
+"""Decode actionApi response bodies, reading only the fields each endpoint needs.
+
+Uses orjson when it is installed (Home Assistant ships it) and the standard
+library otherwise. This module has no Home Assistant imports so
+benchmarks/json_decoding.py can load it on its own.
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    loads = orjson.loads
+else:
+    JSON_BACKEND = "json"
+    loads = json.loads
+
+# The temperature is the only value read from the double-encoded liveData string
+_LIVE_TEMP = re.compile(r'"temp"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|null)\s*[,}]')
+
+def decode_timers(body: bytes) -> list:
+    """Return the raw timer objects of a SetTimerAppliance response."""
+    return loads(body).get("timers") or []
+
+def decode_temperature(body: bytes):
+    """Return the temperature of a DashboardScreen response, or None if liveData has none."""
+    live_data = (loads(body).get("system") or {}).get("liveData") or "{}"
+    if not isinstance(live_data, str):
+        # Already an object, not a double-encoded string
+        return live_data.get("temp")
+
+    if '"temp"' not in live_data:
+        return None
+    # Scan the string rather than building the whole liveData object, but only trust a match that is provably
+    # a top-level key: the only one, with nothing before it opening a nested object or array
+    matches = list(_LIVE_TEMP.finditer(live_data))
+    if len(matches) == 1:
+        start = matches[0].start()
+        outer = live_data.find("{")
+        if live_data.find("{", outer + 1, start) == -1 and live_data.find("[", 0, start) == -1:
+            return loads(matches[0].group(1))
+    return loads(live_data).get("temp")
+
+def decode_chemistry(body: bytes) -> dict:
+    """Return the poolChemistry object of a ChemistryScreen response."""
+    return loads(body).get("poolChemistry", {})
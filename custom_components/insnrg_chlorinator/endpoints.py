@@ -0,0 +1,73 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from .const import ENDPOINT_RETRY_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# actionApi "params" for each endpoint the coordinator reads
+ENDPOINT_PARAMS = {
+    "timers": "SetTimerAppliance",
+    "temperature": "DashboardScreen",
+    "chemistry": "ChemistryScreen",
+}
+
+# Returned by a fetch when the response body matches the last one, so nothing needs parsing or publishing
+UNCHANGED = object()
+
+def fingerprint(body: bytes) -> bytes:
+    """Return a short digest of a raw response body."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+class EndpointState:
+    """Refresh interval, freshness stamp and error state of one actionApi endpoint for one system."""
+
+    def __init__(self, name, interval: timedelta):
+        self.name = name
+        self.interval = interval
+        self.last_success = None
+        self.last_error = None
+        self.next_due = None  # None means fetch on the next refresh
+        # Digest of the last body that was parsed successfully, and how often it was seen again
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self._pending_fingerprint = None
+
+    def is_due(self, now: datetime) -> bool:
+        return self.next_due is None or now >= self.next_due
+
+    def due_in(self, now: datetime) -> timedelta:
+        if self.next_due is None:
+            return timedelta(0)
+        return self.next_due - now
+
+    def is_unchanged(self, body: bytes) -> bool:
+        """Return True if the body matches the last successfully parsed one, counting hits and misses."""
+        digest = fingerprint(body)
+        if digest == self.fingerprint:
+            self.hits += 1
+            return True
+        self.misses += 1
+        # Only trusted once the body has been parsed and the fetch recorded as a success
+        self._pending_fingerprint = digest
+        return False
+
+    def discard_fingerprint(self):
+        """Don't remember the body being handled, so the next identical body is parsed again."""
+        self._pending_fingerprint = None
+
+    def record_success(self, now: datetime):
+        if self._pending_fingerprint is not None:
+            self.fingerprint = self._pending_fingerprint
+            self._pending_fingerprint = None
+        self.last_success = now
+        self.last_error = None
+        self.next_due = now + self.interval
+
+    def record_error(self, now: datetime, err):
+        _LOGGER.debug(f"{ENDPOINT_PARAMS[self.name]} failed, keeping the last result: {err}")
+        self.last_error = str(err)
+        self._pending_fingerprint = None
+        # Try again sooner than the usual interval, but don't hammer a failing endpoint
+        self.next_due = now + min(self.interval, ENDPOINT_RETRY_INTERVAL)
@@ -0,0 +1,113 @@
+import csv
+import importlib.util
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from .const import EXPORT_CHUNK_SIZE, EXPORT_DIRECTORY
+from .history import HISTORY_SERIES
+
+_LOGGER = logging.getLogger(__name__)
+EXPORT_FIELDS = ("time", "system_id", "series", "value")
+
+class _CsvWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_FIELDS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+class _JsonlWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        self._file.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows)
+
+    def close(self):
+        self._file.close()
+
+class _ParquetWriter:
+    def __init__(self, path):
+        # Only imported for Parquet exports, pyarrow is optional and heavy
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("time", pa.string()),
+            ("system_id", pa.string()),
+            ("series", pa.string()),
+            ("value", pa.float64()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        # Each chunk becomes its own row group, so memory use stays at one chunk
+        columns = list(zip(*rows))
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+            schema=self._schema,
+        ))
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+def export_path(hass: HomeAssistant, filename, extension, prefix="insnrg_history") -> str:
+    """Return where an export goes; only a bare file name is accepted, inside the export directory."""
+    if filename is None:
+        filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    if os.path.basename(filename) != filename or filename in ("", ".", ".."):
+        raise HomeAssistantError(f"Export file name must not contain a path: {filename}")
+    return hass.config.path(EXPORT_DIRECTORY, filename)
+
+def _open_writer(fmt, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return WRITERS[fmt](path)
+
+async def async_export_history(hass: HomeAssistant, coordinators, fmt, path, start=None, end=None, system_ids=None) -> int:
+    """Stream the sample history of the selected systems to a file, returning the number of samples written.
+
+    Samples are read from the in-memory history a chunk at a time, by time
+    cursor, and each chunk is written on the executor. Refreshes can carry on
+    in between without the export ever holding more than one chunk.
+    """
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HomeAssistantError("Parquet export needs the pyarrow package, which is not installed")
+
+    after = start.timestamp() if start else float("-inf")
+    until = end.timestamp() if end else float("inf")
+    wanted = {str(system_id) for system_id in system_ids} if system_ids else None
+
+    writer = await hass.async_add_executor_job(_open_writer, fmt, path)
+    written = 0
+    try:
+        for coordinator in coordinators:
+            for system_id, system in coordinator.systems.items():
+                if wanted is not None and str(system_id) not in wanted:
+                    continue
+                for name in HISTORY_SERIES:
+                    series = system.history.series[name]
+                    cursor = after
+                    while chunk := series.samples_after(cursor, until, EXPORT_CHUNK_SIZE):
+                        cursor = chunk[-1][0]
+                        rows = [
+                            (datetime.fromtimestamp(when, timezone.utc).isoformat(), str(system_id), name, value)
+                            for when, value in chunk
+                        ]
+                        await hass.async_add_executor_job(writer.write, rows)
+                        written += len(rows)
+    finally:
+        await hass.async_add_executor_job(writer.close)
+
+    _LOGGER.info(f"Exported {written} history samples to {path}")
+    return written
@@ -0,0 +1,78 @@
+import logging
+from .const import (
+    DEFAULT_FILTER_WINDOW,
+    FILTER_THRESHOLD,
+    FILTER_WARMUP,
+    FILTER_MAX_CONSECUTIVE_REJECTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class SpikeFilter:
+    """Streaming spike filter for one chemistry reading.
+
+    Readings outside the physical limits are always rejected. For measured
+    values, an exponentially weighted baseline and mean absolute deviation
+    (a running, O(1) take on a Hampel filter) reject readings that jump more
+    than FILTER_THRESHOLD deviations away. A jump that persists after
+    FILTER_MAX_CONSECUTIVE_REJECTS rejections in a row is taken as a real
+    change, and the next such reading becomes the new baseline.
+    """
+
+    def __init__(self, limits=(None, None), min_deviation=None, window=DEFAULT_FILTER_WINDOW):
+        self.limits = limits
+        # None means range checks only, for values that are set rather than measured
+        self.min_deviation = min_deviation
+        self.window = window
+        self.baseline = None
+        self.deviation = 0.0
+        self.count = 0
+        self.rejected = 0
+        self._consecutive = 0
+
+    @property
+    def alpha(self):
+        return 2 / (self.window + 1)
+
+    def accept(self, value) -> bool:
+        """Return True if the reading should be published, updating the filter state."""
+        low, high = self.limits
+        if (low is not None and value < low) or (high is not None and value > high):
+            self.rejected += 1
+            return False
+        if self.min_deviation is None:
+            return True
+
+        if self.baseline is None:
+            self.baseline = value
+            self.count = 1
+            return True
+
+        residual = abs(value - self.baseline)
+        if self.count >= FILTER_WARMUP and residual > FILTER_THRESHOLD * max(self.deviation, self.min_deviation):
+            if self._consecutive < FILTER_MAX_CONSECUTIVE_REJECTS:
+                self._consecutive += 1
+                self.rejected += 1
+                return False
+            # Not a spike after all, so start again from the new level
+            _LOGGER.debug(f"Accepting {value} as a new level after {self._consecutive} rejected readings")
+            self.baseline = value
+            self.deviation = 0.0
+            self.count = 1
+            self._consecutive = 0
+            return True
+
+        self._consecutive = 0
+        self.deviation += self.alpha * (residual - self.deviation)
+        self.baseline += self.alpha * (value - self.baseline)
+        self.count += 1
+        return True
+
+def chemistry_filters(window=DEFAULT_FILTER_WINDOW):
+    """Return a fresh SpikeFilter for each numeric chemistry key of one system."""
+    return {
+        "currentPh": SpikeFilter(limits=(0, 14), min_deviation=0.05, window=window),
+        "setPointPh": SpikeFilter(limits=(0, 14)),
+        "currentORP": SpikeFilter(limits=(0, 2000), min_deviation=10, window=window),
+        "setPointORP": SpikeFilter(limits=(0, 2000)),
+    }
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from homeassistant.core import HomeAssistant, callback
+from .const import (
+    DOMAIN,
+    FLEET_REQUEST_RATE,
+    FLEET_REQUEST_BURST,
+    FLEET_MAX_CONCURRENT_REQUESTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+DATA_FLEET = f"{DOMAIN}_fleet"
+# Fractional part of the golden ratio; multiples of it spread any number of entries evenly over [0, 1)
+_GOLDEN_FRACTION = 0.6180339887498949
+
+class Fleet:
+    """Schedules and rate limits actionApi requests across every config entry.
+
+    Each entry gets a stable phase within the refresh interval. On a restart
+    from cached data, an entry's first refresh waits for its phase, so entries
+    set up together don't all poll at the same moment; entries without a cache
+    refresh straight away, as their sensors need the data. After that, phases
+    only spread planned refreshes over REFRESH_STAGGER_WINDOW. Requests then
+    pass through a token bucket (average rate plus a burst allowance) and a
+    concurrency cap, which is what limits a burst of uncached setups.
+    """
+
+    def __init__(self, rate=FLEET_REQUEST_RATE, burst=FLEET_REQUEST_BURST, max_concurrent=FLEET_MAX_CONCURRENT_REQUESTS):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        # Token waits go one at a time, so requests are served in arrival order
+        self._bucket_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._slots = {}
+        # Reported through stats()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def stagger_offset(self, entry_id, period: timedelta) -> timedelta:
+        """Return how far into the period this entry should poll; the first entry polls straight away."""
+        slot = self._slots.setdefault(entry_id, len(self._slots))
+        return period * ((slot * _GOLDEN_FRACTION) % 1)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a request token and a free concurrency slot, then hold the slot for one request."""
+        start = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._bucket_lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self._rate)
+                    self._refill()
+                self._tokens -= 1
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        wait = time.monotonic() - start
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Return queue depth and wait time figures for logging."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "mean_wait": round(self.total_wait / self.requests, 3) if self.requests else 0.0,
+            "max_wait": round(self.max_wait, 3),
+        }
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> Fleet:
+    """Return the scheduler and rate limiter shared by every INSNRG entry."""
+    fleet = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = Fleet()
+    return fleet
@@ -0,0 +1,186 @@
+import logging
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from .const import HISTORY_CAPACITY, HISTORY_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+# Series kept per system
+HISTORY_SERIES = ("ph", "orp", "temperature")
+
+@dataclass(frozen=True, slots=True)
+class RollingStats:
+    """Statistics over the samples currently inside a series' window."""
+
+    count: int = 0
+    mean: float | None = None
+    minimum: float | None = None
+    maximum: float | None = None
+    slope: float | None = None  # Change per hour, from a least-squares fit
+
+class RollingSeries:
+    """Bounded, array-backed ring buffer of timestamped samples with O(1) rolling statistics.
+
+    Samples leave the buffer when it is full or once they are older than the
+    window. Running sums give the mean and least-squares slope, and monotonic
+    deques give the min and max, so every new or expiring sample costs
+    amortized O(1). The sums are rebuilt once per `capacity` samples so
+    floating-point drift can't accumulate.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY, window=HISTORY_WINDOW.total_seconds()):
+        self._capacity = capacity
+        self._window = window
+        self._times = array("d", bytes(8 * capacity))  # Epoch seconds
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+        self._pushed = 0  # Sequence number of the next sample, used to expire min/max candidates
+        self._min = deque()  # (sequence, value), values increasing
+        self._max = deque()  # (sequence, value), values decreasing
+        self._reset_sums()
+
+    def __len__(self):
+        return self._count
+
+    def _reset_sums(self):
+        # Times enter the sums as hours since the oldest sample, which keeps the squares small
+        self._origin = self._times[self._start] if self._count else None
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+        self._since_rebuild = 0
+        for i in range(self._count):
+            slot = (self._start + i) % self._capacity
+            self._add_to_sums(self._times[slot], self._values[slot], 1)
+
+    def _add_to_sums(self, when, value, sign):
+        x = (when - self._origin) / 3600
+        self._sum_x += sign * x
+        self._sum_y += sign * value
+        self._sum_xx += sign * x * x
+        self._sum_xy += sign * x * value
+
+    def add(self, when: float, value: float):
+        """Append a sample taken at `when` (epoch seconds). Samples that aren't newer than the last are ignored."""
+        if self._count and when <= self._times[(self._start + self._count - 1) % self._capacity]:
+            return
+        if self._count == self._capacity:
+            self._pop_oldest()
+
+        slot = (self._start + self._count) % self._capacity
+        self._times[slot] = when
+        self._values[slot] = value
+        self._count += 1
+        if self._origin is None:
+            self._origin = when
+        self._add_to_sums(when, value, 1)
+
+        sequence = self._pushed
+        self._pushed += 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((sequence, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((sequence, value))
+
+        self.expire(when)
+        self._since_rebuild += 1
+        if self._since_rebuild >= self._capacity:
+            self._reset_sums()
+
+    def expire(self, now: float):
+        """Drop samples that have fallen out of the window."""
+        while self._count and self._times[self._start] < now - self._window:
+            self._pop_oldest()
+
+    def _pop_oldest(self):
+        self._add_to_sums(self._times[self._start], self._values[self._start], -1)
+        sequence = self._pushed - self._count
+        if self._min[0][0] == sequence:
+            self._min.popleft()
+        if self._max[0][0] == sequence:
+            self._max.popleft()
+        self._start = (self._start + 1) % self._capacity
+        self._count -= 1
+        if not self._count:
+            self._reset_sums()
+
+    def stats(self) -> RollingStats:
+        n = self._count
+        if not n:
+            return RollingStats()
+        slope = None
+        denominator = n * self._sum_xx - self._sum_x * self._sum_x
+        if n > 1 and denominator > 1e-9:
+            slope = (n * self._sum_xy - self._sum_x * self._sum_y) / denominator
+        return RollingStats(
+            count=n,
+            mean=self._sum_y / n,
+            minimum=self._min[0][1],
+            maximum=self._max[0][1],
+            slope=slope,
+        )
+
+    def _bisect(self, when: float) -> int:
+        """Return the position (0 = oldest) of the first sample taken after `when`."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[(self._start + middle) % self._capacity] <= when:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def samples_after(self, after: float, until: float, limit: int) -> list:
+        """Return up to `limit` samples taken in (after, until], oldest first, as [epoch seconds, value] pairs.
+
+        Lets callers page through the buffer by time, which stays correct while samples are added and expired.
+        """
+        first = self._bisect(after)
+        last = min(self._bisect(until), first + limit)
+        return [
+            [self._times[(self._start + i) % self._capacity], self._values[(self._start + i) % self._capacity]]
+            for i in range(first, last)
+        ]
+
+    def samples(self) -> list:
+        """Return the samples oldest first, as [epoch seconds, value] pairs."""
+        return [
+            [self._times[(self._start + i) % self._capacity], self._values[(self._start + i) % self._capacity]]
+            for i in range(self._count)
+        ]
+
+class ChemistryHistory:
+    """Rolling pH, ORP and temperature history of one system."""
+
+    def __init__(self):
+        self.series = {name: RollingSeries() for name in HISTORY_SERIES}
+
+    def add(self, name, when: datetime, value):
+        self.series[name].add(when.timestamp(), float(value))
+
+    def expire(self, now: datetime):
+        for series in self.series.values():
+            series.expire(now.timestamp())
+
+    def stats(self):
+        """Return the current RollingStats of every series, keyed by series name."""
+        return MappingProxyType({name: series.stats() for name, series in self.series.items()})
+
+    def to_dict(self) -> dict:
+        return {name: series.samples() for name, series in self.series.items()}
+
+    def load(self, data: dict):
+        """Replay saved samples into the buffers, skipping anything unreadable."""
+        for name, samples in (data or {}).items():
+            if name not in self.series:
+                continue
+            try:
+                for when, value in samples:
+                    self.series[name].add(float(when), float(value))
+            except (TypeError, ValueError) as err:
+                _LOGGER.warning(f"Ignoring unreadable {name} history: {err}")
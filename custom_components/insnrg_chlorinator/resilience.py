@@ -0,0 +1,100 @@
+import logging
+import random
+import time
+from homeassistant.core import HomeAssistant, callback
+from .const import (
+    DOMAIN,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_MAX_RESET_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+DATA_BREAKER = f"{DOMAIN}_breaker"
+
+class TransientError(Exception):
+    """A request failure worth retrying: timeouts, connection errors, 429 and 5xx responses."""
+
+class CircuitOpenError(Exception):
+    """The API is considered unhealthy and requests are being held back."""
+
+def backoff_delay(attempt) -> float:
+    """Return a 'full jitter' exponential backoff delay in seconds for a retry attempt (0-based)."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+class CircuitBreaker:
+    """Stops hammering actionApi while it is failing.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failed requests the breaker
+    opens and every request fails fast. Once the (jittered) reset timeout has
+    passed, a single probe request is let through: success closes the
+    breaker, failure opens it again with double the timeout.
+    """
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.open_until = 0.0
+        self._reset_timeout = BREAKER_RESET_TIMEOUT.total_seconds()
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a probe through, 0 if closed."""
+        if not self.is_open:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return whether a request may go ahead. Callers must call end_probe() once it has finished."""
+        if not self.is_open:
+            return True
+        if self._probing or time.monotonic() < self.open_until:
+            return False
+        _LOGGER.debug("Circuit breaker half-open, probing actionApi")
+        self._probing = True
+        return True
+
+    def end_probe(self):
+        """Release the half-open probe slot taken by allow_request(), once the probe request has finished."""
+        self._probing = False
+
+    def record_success(self):
+        if self.is_open:
+            _LOGGER.info("actionApi is responding again, closing circuit breaker")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._reset_timeout = BREAKER_RESET_TIMEOUT.total_seconds()
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing:
+            # The probe failed, back off further
+            self._probing = False
+            self._reset_timeout = min(self._reset_timeout * 2, BREAKER_MAX_RESET_TIMEOUT.total_seconds())
+            self._open()
+        elif not self.is_open and self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self):
+        now = time.monotonic()
+        if self.opened_at is None:
+            self.opened_at = now
+        # Jitter so entries and restarts don't all probe at the same moment
+        timeout = self._reset_timeout * random.uniform(0.8, 1.2)
+        self.open_until = now + timeout
+        _LOGGER.warning("actionApi is failing, holding requests back for %.0f s", timeout)
+
+@callback
+def async_get_breaker(hass: HomeAssistant) -> CircuitBreaker:
+    """Return the circuit breaker shared by every INSNRG entry, since they all call the same API."""
+    breaker = hass.data.get(DATA_BREAKER)
+    if breaker is None:
+        breaker = hass.data[DATA_BREAKER] = CircuitBreaker()
+    return breaker
@@ -0,0 +1,38 @@
+import logging
+from datetime import datetime, timedelta
+from .const import (
+    SCAN_INTERVAL,
+    IDLE_SCAN_INTERVAL,
+    TIMER_SETTLE_DELAY,
+    TIMER_STOP_LEAD,
+    MIN_REFRESH_INTERVAL,
+)
+from .timer_index import TimerIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+def next_refresh_interval(timer_index: TimerIndex, now: datetime, active_interval=SCAN_INTERVAL, idle_interval=IDLE_SCAN_INTERVAL) -> timedelta:
+    """Work out how long to wait before the next refresh.
+
+    Plans a refresh shortly after each chlorinator run starts (once readings have
+    settled) and one just before it stops. Between those, the interval is capped
+    at active_interval while chlorinating and idle_interval otherwise.
+    """
+    chlorinating = timer_index.is_active(now)
+    interval = active_interval if chlorinating else idle_interval
+
+    transition = timer_index.next_transition(now)
+    if transition is not None:
+        if chlorinating:
+            boundary = transition - TIMER_STOP_LEAD
+            if boundary - now < MIN_REFRESH_INTERVAL:
+                # Too close to the stop already, plan for the next run instead
+                next_start = timer_index.next_transition(transition)
+                boundary = next_start + TIMER_SETTLE_DELAY if next_start else None
+        else:
+            boundary = transition + TIMER_SETTLE_DELAY
+        if boundary is not None:
+            interval = min(interval, boundary - now)
+
+    _LOGGER.debug("Next refresh in %s", interval)
+    return max(interval, MIN_REFRESH_INTERVAL)
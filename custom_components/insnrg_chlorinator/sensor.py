@@ -1,13 +1,8 @@
 import logging
-import requests
-import aiohttp
-import async_timeout
 import uuid
-import re
-from datetime import datetime, timedelta
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
 from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -15,190 +10,174 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.const import (
+    EntityCategory,
     UnitOfElectricPotential, # ORP
     UnitOfTemperature,
+    UnitOfTime,
 )
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(hours=1)
 
 async def async_setup_entry(hass, config, async_add_entities) -> None:
     _LOGGER.debug("Setting up sensors in sensor.py")
     coordinator = hass.data[DOMAIN][config.entry_id]["coordinator"]
 
-    sensors = [
-        InsnrgpHSensor(coordinator, "Current pH", "currentPh"),
-        InsnrgpHSensor(coordinator, "Set Point pH", "setPointPh"),
-        InsnrgConnectionSensor(coordinator, "pH Connected", "pHConnected"),
-        InsnrgOrpSensor(coordinator, "Current ORP", "currentORP"),
-        InsnrgOrpSensor(coordinator, "Set Point ORP", "setPointORP"),
-        InsnrgConnectionSensor(coordinator, "ORP Connected", "orpConnected"),
-        InsnrgTempSensor(coordinator, "Current Temperature", "temperature")
-    ]
-
-    # Access the timer data
-    timer_data = coordinator.data.get("timers", [])
-
-    # Dynamically create timer sensors
-    for i, timer in enumerate(timer_data):
-        timer_number = timer.get("timer_number", i)
-        sensors.append(InsnrgTimerStartSensor(coordinator, f"Timer {timer_number} Start", "start_time", i))
-        sensors.append(InsnrgTimerStopSensor(coordinator, f"Timer {timer_number} End", "stop_time", i))
-        sensors.append(InsnrgTimerChlorinatorSensor(coordinator, f"Timer {timer_number} Operates Chlorinator", "chlorinator", i))
-        sensors.append(InsnrgTimerEnabledSensor(coordinator, f"Timer {timer_number} Enabled", "enabled", i))
+    sensors = []
+    for system_id in coordinator.systems:
+        # Entities of additional systems carry the system ID so their names don't clash
+        suffix = "" if system_id == coordinator.primary_system_id else f" ({system_id})"
+        sensors.extend([
+            InsnrgpHSensor(coordinator, system_id, f"Current pH{suffix}", "currentPh"),
+            InsnrgpHSensor(coordinator, system_id, f"Set Point pH{suffix}", "setPointPh"),
+            InsnrgConnectionSensor(coordinator, system_id, f"pH Connected{suffix}", "pHConnected"),
+            InsnrgOrpSensor(coordinator, system_id, f"Current ORP{suffix}", "currentORP"),
+            InsnrgOrpSensor(coordinator, system_id, f"Set Point ORP{suffix}", "setPointORP"),
+            InsnrgConnectionSensor(coordinator, system_id, f"ORP Connected{suffix}", "orpConnected"),
+            InsnrgTempSensor(coordinator, system_id, f"Current Temperature{suffix}", "temperature"),
+            InsnrgChlorinatingTimeSensor(coordinator, system_id, f"Daily Chlorinating Time{suffix}", "chlorinating_minutes"),
+            InsnrgChemistryUpdatedSensor(coordinator, system_id, f"Chemistry Last Updated{suffix}", "chemistry_updated"),
+            InsnrgHistorySensor(coordinator, system_id, f"Chlorinator pH 24h Average{suffix}", "ph"),
+            InsnrgHistorySensor(coordinator, system_id, f"Chlorinator ORP 24h Average{suffix}", "orp"),
+            InsnrgHistorySensor(coordinator, system_id, f"Pool Temperature 24h Average{suffix}", "temperature"),
+        ])
+
+        # Access the timer data
+        timer_data = coordinator.data[system_id].timers
+
+        # Dynamically create timer sensors
+        for i, timer in enumerate(timer_data):
+            timer_number = timer.get("timer_number", i)
+            sensors.append(InsnrgTimerStartSensor(coordinator, system_id, f"Timer {timer_number} Start{suffix}", "start_time", i))
+            sensors.append(InsnrgTimerStopSensor(coordinator, system_id, f"Timer {timer_number} End{suffix}", "stop_time", i))
+            sensors.append(InsnrgTimerChlorinatorSensor(coordinator, system_id, f"Timer {timer_number} Operates Chlorinator{suffix}", "chlorinator", i))
+            sensors.append(InsnrgTimerEnabledSensor(coordinator, system_id, f"Timer {timer_number} Enabled{suffix}", "enabled", i))
 
     async_add_entities(sensors)
 
     # Store the sensors in hass.data for future updates
     hass.data[DOMAIN][config.entry_id]["sensors"].extend(sensors)
 
+def _unique_id(coordinator, system_id, key):
+    """Return an entity unique ID, keeping the original IDs for the primary system."""
+    if system_id == coordinator.primary_system_id:
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{key}"))
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{system_id}_{key}"))
+
+def _device_info(coordinator, system_id):
+    """Return the device that groups one system's entities."""
+    name = "INSNRG Chlorinator" if system_id == coordinator.primary_system_id else f"INSNRG Chlorinator {system_id}"
+    return DeviceInfo(identifiers={(DOMAIN, str(system_id))}, manufacturer="INSNRG", name=name)
 
 async def update_sensors(hass, sensors):
     for sensor in sensors:
         await sensor.async_update()
 
-class InsnrgConnectionSensor(RestoreEntity):
-    def __init__(self, coordinator, name, data_key):
+class InsnrgCoordinatorSensor:
+    """Pushes coordinator updates to a sensor, writing its state only when the coordinator says `_update_key` changed."""
+
+    _attr_should_poll = False  # Updates are pushed by the coordinator
+
+    async def async_added_to_hass(self):
+        """When entity is added to Home Assistant."""
+        await super().async_added_to_hass()
+        # Register the callback to update sensor when coordinator updates
+        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Skip the state write if this sensor's value didn't change
+        if not self._coordinator.has_changed(self._system_id, self._update_key):
+            return
+        _LOGGER.debug(f"Updating {self._name} via callback.")
+        # Notify Home Assistant that the sensor's state has been updated
+        self.async_write_ha_state()
+
+class InsnrgConnectionSensor(InsnrgCoordinatorSensor, RestoreEntity):
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._state = None
         self._last_state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}"))
+        self._update_key = data_key
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     async def async_added_to_hass(self):
         """When entity is added to Home Assistant."""
         await super().async_added_to_hass()
         self._last_state = await self.async_get_last_state()
         if not self._last_state:
-            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until after your chlorinator is running for an hour.")
+            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until your chlorinator next runs.")
             return
         _LOGGER.info(f"Recovering last known state of {self._name} ({self._last_state.state}).")
         self._state = self._last_state.state
 
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
-
     @property
     def name(self):
         return f"Chlorinator {self._name}"
 
     @property
     def state(self):
-        # Check if pool_chemistry is not None before updating the state
-        try:
-            pool_chemistry = self._coordinator.data.get("pool_chemistry")
-        except Exception:
-            pool_chemistry = None
-        if pool_chemistry is None:
-            # If pool_chemistry is None (chlorinator off), don't update the state
+        reading = self._coordinator.data[self._system_id].reading(self._data_key)
+        if reading is None:
+            # If there is no chemistry yet (chlorinator off), don't update the state
             return self._last_state.state if self._last_state is not None else "unknown"
         # Update the state based on the pool_chemistry data
-        self._state = pool_chemistry.get(self._data_key)
+        self._state = reading.raw
         if self._last_state is not None:
             self._last_state.state = self._state
         return self._state
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_updated": self._coordinator.updated
-        }
-
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgpHSensor(RestoreEntity):
+class InsnrgpHSensor(InsnrgCoordinatorSensor, RestoreEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.PH
     _attr_suggested_display_precision = 1
 
-    def __init__(self, coordinator, name, data_key):
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._state = None
         self._last_state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}"))
+        self._update_key = data_key
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     async def async_added_to_hass(self):
         """When entity is added to Home Assistant."""
         await super().async_added_to_hass()
         self._last_state = await self.async_get_last_state()
         if not self._last_state:
-            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until after your chlorinator is running for an hour.")
+            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until your chlorinator next runs.")
             return
         _LOGGER.info(f"Recovering last known state of {self._name} ({self._last_state.state}).")
         self._state = self._last_state.state
 
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
-
     @property
     def name(self):
         return f"Chlorinator {self._name}"
 
     @property
     def state(self):
-        # Check if pool_chemistry is not None before updating the state
-        try:
-            pool_chemistry = self._coordinator.data.get("pool_chemistry")
-        except Exception:
-            pool_chemistry = None
-
-        if pool_chemistry is None:
-            # If pool_chemistry is None (chlorinator off), return the last known state or "unknown"
+        reading = self._coordinator.data[self._system_id].reading(self._data_key)
+        if reading is None:
+            # If there is no chemistry yet (chlorinator off), return the last known state or "unknown"
             return self._last_state.state if self._last_state is not None else "unknown"
 
-        # Safely fetch and convert the data
-        def get_numeric_value(data, key):
-            # Safely extract a numeric value for comparison, handling prefixed strings.
-            value = data.get(key)
-            if value is None:
-                return None  # Handle missing key
-            try:
-                # Handle strings with comparison prefixes like '< 300' or '> 8.5'
-                if isinstance(value, str):
-                    match = re.search(r"[-+]?[0-9]*\.?[0-9]+", value)
-                    if match:
-                        numeric_value = float(match.group())
-                        return numeric_value  # Always return as a float for flexibility
-                # Directly convert numeric types
-                return float(value)
-            except (ValueError, TypeError):
-                return None  # Return None if conversion fails
-
-        # Get the numeric value for the data key
-        value = get_numeric_value(pool_chemistry, self._data_key)
-
-        if value is None:
-            # If the value can't be converted to a number, log a warning and return "unknown"
-            _LOGGER.warning("Invalid or missing data for key '%s': %s", self._data_key, pool_chemistry.get(self._data_key))
+        if not reading.valid:
+            # The coordinator has already logged the unparseable value
             return "unknown"
 
-        if value > 14:
-            # If the value is out of range, do not update the state
-            return self._last_state.state if self._last_state is not None else "unknown"
-
-        # Update the state based on the valid numeric value
-        self._state = value
+        # Out of range values and spikes have already been filtered out by the coordinator
+        self._state = reading.value
         if self._last_state is not None:
             self._last_state.state = self._state
         return self._state
@@ -211,96 +190,59 @@ class InsnrgpHSensor(RestoreEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        rejected = self._coordinator.data[self._system_id].rejected or {}
         return {
-            "last_updated": self._coordinator.updated
+            "rejected_readings": rejected.get(self._data_key, 0)
         }
 
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgOrpSensor(RestoreEntity):
+class InsnrgOrpSensor(InsnrgCoordinatorSensor, RestoreEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.VOLTAGE
     _attr_native_unit_of_measurement = UnitOfElectricPotential.MILLIVOLT
     _attr_suggested_display_precision = 0
 
-    def __init__(self, coordinator, name, data_key):
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._state = None
         self._last_state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}"))
+        self._update_key = data_key
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     async def async_added_to_hass(self):
         """When entity is added to Home Assistant."""
         await super().async_added_to_hass()
         self._last_state = await self.async_get_last_state()
         if not self._last_state:
-            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until after your chlorinator is running for an hour.")
+            _LOGGER.info(f"This is the first time {self._name} has been added to HA. It won't obtain data until your chlorinator next runs.")
             return
         _LOGGER.info(f"Recovering last known state of {self._name} ({self._last_state.state}).")
         self._state = self._last_state.state
 
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
-
     @property
     def name(self):
         return f"Chlorinator {self._name}"
 
     @property
     def state(self):
-        # Check if pool_chemistry is not None before updating the state
-        try:
-            pool_chemistry = self._coordinator.data.get("pool_chemistry")
-        except Exception:
-            pool_chemistry = None
-
-        if pool_chemistry is None:
-            # If pool_chemistry is None (chlorinator off), return the last known state or "unknown"
+        reading = self._coordinator.data[self._system_id].reading(self._data_key)
+        if reading is None:
+            # If there is no chemistry yet (chlorinator off), return the last known state or "unknown"
             return self._last_state.state if self._last_state is not None else "unknown"
 
-        # Safely fetch and convert the data
-        def get_numeric_value(data, key):
-            # Safely extract a numeric value for comparison, handling prefixed strings.
-            value = data.get(key)
-            if value is None:
-                return None  # Handle missing key
-            try:
-                # Handle strings with comparison prefixes like '< 300' or '> 8.5'
-                if isinstance(value, str):
-                    match = re.search(r"[-+]?[0-9]*\.?[0-9]+", value)
-                    if match:
-                        numeric_value = float(match.group())
-                        return numeric_value  # Always return as a float for flexibility
-                # Directly convert numeric types
-                return float(value)
-            except (ValueError, TypeError):
-                return None  # Return None if conversion fails
-
-        # Get the numeric value for the data key
-        value = get_numeric_value(pool_chemistry, self._data_key)
-
-        if value is None:
-            # If the value can't be converted to a number, log a warning and return "unknown"
-            _LOGGER.warning("Invalid or missing data for key '%s': %s", self._data_key, pool_chemistry.get(self._data_key))
+        if not reading.valid:
+            # The coordinator has already logged the unparseable value
             return "unknown"
 
-        if int(value) > 2000:
-            # If the value is out of range, do not update the state
-            return self._last_state.state if self._last_state is not None else "unknown"
-
-        # Update the state based on the valid numeric value
-        self._state = int(value)
+        # Out of range values and spikes have already been filtered out by the coordinator
+        self._state = int(reading.value)
         if self._last_state is not None:
             self._last_state.state = self._state
         return self._state
@@ -313,10 +255,11 @@ class InsnrgOrpSensor(RestoreEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        rejected = self._coordinator.data[self._system_id].rejected or {}
         return {
-            "last_updated": self._coordinator.updated,
             "state_class": "measurement",
-            "unit_of_measurement": "mV"
+            "unit_of_measurement": "mV",
+            "rejected_readings": rejected.get(self._data_key, 0)
         }
 
     @property
@@ -326,157 +269,181 @@ class InsnrgOrpSensor(RestoreEntity):
 ### We don't need to get the last known state for the following sensors as we take whatever the API provides even if the chlorinator is not running. 
 ### For the chemistry page we retun none instead of the result from the API outside chlorination hours because sometimes the data is wrong then, so we just use the last known value.
 
-class InsnrgTempSensor(SensorEntity):
-    def __init__(self, coordinator, name, data_key):
+class InsnrgTempSensor(InsnrgCoordinatorSensor, SensorEntity):
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}"))
+        self._update_key = data_key
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_suggested_display_precision = 1
 
-    async def async_added_to_hass(self):
-        """When entity is added to Home Assistant."""
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
-
     @property
     def name(self):
         return f"Pool {self._name}"
 
     @property
     def state(self):
-        return self._coordinator.data.get(self._data_key)
+        return self._coordinator.data[self._system_id].temperature
 
     @property
     def native_value(self) -> StateType:
         """Return value of sensor."""
         return self.attribute_value
 
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+class InsnrgChlorinatingTimeSensor(InsnrgCoordinatorSensor, SensorEntity):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(self, coordinator, system_id, name, data_key):
+        self._coordinator = coordinator
+        self._system_id = system_id
+        self._name = name
+        self._data_key = data_key
+        self._update_key = "schedule"
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
+
+    @property
+    def name(self):
+        return f"Chlorinator {self._name}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the total minutes per day covered by enabled chlorinator timers."""
+        return self._coordinator.data[self._system_id].chlorinating_minutes
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        snapshot = self._coordinator.data[self._system_id]
         return {
-            "last_updated": self._coordinator.updated
+            "chlorinating": snapshot.chlorinating,
+            "next_change": snapshot.next_change.isoformat() if snapshot.next_change else None,
         }
 
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgTimerStartSensor(SensorEntity):
-    def __init__(self, coordinator, name, data_key, timer_index):
+### Freshness lives on its own diagnostic sensor, so a new reading doesn't change every other sensor's attributes
+### and add a recorder row for each of them.
+
+class InsnrgChemistryUpdatedSensor(InsnrgCoordinatorSensor, SensorEntity):
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
-        self._timer_index = timer_index
-        self._state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}_{timer_index}"))
-
-    async def async_added_to_hass(self):
-        """When entity is added to Home Assistant."""
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
+        self._update_key = data_key
+        self._unique_id = _unique_id(coordinator, system_id, data_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     @property
     def name(self):
-        return f"INSNRG {self._name}"
+        return f"Chlorinator {self._name}"
 
     @property
-    def state(self):
-        """Return the start time for this timer."""
-        return self._coordinator.data.get("timers", [])[self._timer_index].get(self._data_key) 
+    def native_value(self):
+        """Return when pool chemistry was last read from the API."""
+        chemistry_updated = self._coordinator.data[self._system_id].chemistry_updated
+        # Timestamp sensors need a timezone-aware datetime
+        return chemistry_updated.astimezone() if chemistry_updated else None
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        snapshot = self._coordinator.data[self._system_id]
         return {
-            "last_updated": self._coordinator.updated
+            "stale": snapshot.stale,
+            "failing_endpoints": list(snapshot.errors),
         }
 
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgTimerStopSensor(SensorEntity):
-    def __init__(self, coordinator, name, data_key, timer_index):
+### Rolling statistics come from the coordinator's in-memory history, so no recorder queries are needed.
+
+HISTORY_SENSOR_UNITS = {
+    "ph": (SensorDeviceClass.PH, None, 2),
+    "orp": (SensorDeviceClass.VOLTAGE, UnitOfElectricPotential.MILLIVOLT, 0),
+    "temperature": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, 1),
+}
+
+class InsnrgHistorySensor(InsnrgCoordinatorSensor, SensorEntity):
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, system_id, name, data_key):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
-        self._timer_index = timer_index
-        self._state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}_{timer_index}"))
+        self._update_key = f"history_{data_key}"
+        self._unique_id = _unique_id(coordinator, system_id, self._update_key)
+        self._attr_device_info = _device_info(coordinator, system_id)
+        device_class, unit, precision = HISTORY_SENSOR_UNITS[data_key]
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_display_precision = precision
 
-    async def async_added_to_hass(self):
-        """When entity is added to Home Assistant."""
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
+    def _stats(self):
+        history = self._coordinator.data[self._system_id].history
+        return history.get(self._data_key) if history else None
 
     @property
     def name(self):
-        return f"INSNRG {self._name}"
+        return self._name
 
     @property
-    def state(self):
-        """Return the start time for this timer."""
-        return self._coordinator.data.get("timers", [])[self._timer_index].get(self._data_key) 
+    def native_value(self) -> StateType:
+        """Return the mean of the samples in the last 24 hours."""
+        stats = self._stats()
+        return round(stats.mean, 3) if stats and stats.count else None
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
+        stats = self._stats()
+        if not stats or not stats.count:
+            return {"count": 0}
         return {
-            "last_updated": self._coordinator.updated
+            "count": stats.count,
+            "min": stats.minimum,
+            "max": stats.maximum,
+            # Least-squares trend over the window, in units per hour
+            "slope_per_hour": round(stats.slope, 4) if stats.slope is not None else None,
         }
 
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgTimerChlorinatorSensor(SensorEntity):
-    def __init__(self, coordinator, name, data_key, timer_index):
+class InsnrgTimerStartSensor(InsnrgCoordinatorSensor, SensorEntity):
+    def __init__(self, coordinator, system_id, name, data_key, timer_index):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._timer_index = timer_index
         self._state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}_{timer_index}"))
-
-    async def async_added_to_hass(self):
-        """When entity is added to Home Assistant."""
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
+        self._update_key = f"timer_{timer_index}"
+        self._unique_id = _unique_id(coordinator, system_id, f"{data_key}_{timer_index}")
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     @property
     def name(self):
@@ -485,39 +452,48 @@ class InsnrgTimerChlorinatorSensor(SensorEntity):
     @property
     def state(self):
         """Return the start time for this timer."""
-        return self._coordinator.data.get("timers", [])[self._timer_index].get(self._data_key) 
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_updated": self._coordinator.updated
-        }
+        return self._coordinator.data[self._system_id].timers[self._timer_index].get(self._data_key) 
 
     @property
     def unique_id(self):
         return self._unique_id
 
-class InsnrgTimerEnabledSensor(SensorEntity):
-    def __init__(self, coordinator, name, data_key, timer_index):
+class InsnrgTimerStopSensor(InsnrgCoordinatorSensor, SensorEntity):
+    def __init__(self, coordinator, system_id, name, data_key, timer_index):
         self._coordinator = coordinator
+        self._system_id = system_id
         self._name = name
         self._timer_index = timer_index
         self._state = None
         self._data_key = data_key
-        self._last_updated = None
-        self._unique_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{DOMAIN}_{data_key}_{timer_index}"))
+        self._update_key = f"timer_{timer_index}"
+        self._unique_id = _unique_id(coordinator, system_id, f"{data_key}_{timer_index}")
+        self._attr_device_info = _device_info(coordinator, system_id)
 
-    async def async_added_to_hass(self):
-        """When entity is added to Home Assistant."""
-        # Register the callback to update sensor when coordinator updates
-        self.async_on_remove(self._coordinator.async_add_listener(self._handle_coordinator_update))
+    @property
+    def name(self):
+        return f"INSNRG {self._name}"
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug(f"Updating {self._name} via callback.")
-        # Notify Home Assistant that the sensor's state has been updated
-        self.async_write_ha_state()
+    @property
+    def state(self):
+        """Return the start time for this timer."""
+        return self._coordinator.data[self._system_id].timers[self._timer_index].get(self._data_key) 
+
+    @property
+    def unique_id(self):
+        return self._unique_id
+
+class InsnrgTimerChlorinatorSensor(InsnrgCoordinatorSensor, SensorEntity):
+    def __init__(self, coordinator, system_id, name, data_key, timer_index):
+        self._coordinator = coordinator
+        self._system_id = system_id
+        self._name = name
+        self._timer_index = timer_index
+        self._state = None
+        self._data_key = data_key
+        self._update_key = f"timer_{timer_index}"
+        self._unique_id = _unique_id(coordinator, system_id, f"{data_key}_{timer_index}")
+        self._attr_device_info = _device_info(coordinator, system_id)
 
     @property
     def name(self):
@@ -526,14 +502,32 @@ class InsnrgTimerEnabledSensor(SensorEntity):
     @property
     def state(self):
         """Return the start time for this timer."""
-        return self._coordinator.data.get("timers", [])[self._timer_index].get(self._data_key) 
+        return self._coordinator.data[self._system_id].timers[self._timer_index].get(self._data_key) 
 
     @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_updated": self._coordinator.updated
-        }
+    def unique_id(self):
+        return self._unique_id
+
+class InsnrgTimerEnabledSensor(InsnrgCoordinatorSensor, SensorEntity):
+    def __init__(self, coordinator, system_id, name, data_key, timer_index):
+        self._coordinator = coordinator
+        self._system_id = system_id
+        self._name = name
+        self._timer_index = timer_index
+        self._state = None
+        self._data_key = data_key
+        self._update_key = f"timer_{timer_index}"
+        self._unique_id = _unique_id(coordinator, system_id, f"{data_key}_{timer_index}")
+        self._attr_device_info = _device_info(coordinator, system_id)
+
+    @property
+    def name(self):
+        return f"INSNRG {self._name}"
+
+    @property
+    def state(self):
+        """Return the start time for this timer."""
+        return self._coordinator.data[self._system_id].timers[self._timer_index].get(self._data_key) 
 
     @property
     def unique_id(self):
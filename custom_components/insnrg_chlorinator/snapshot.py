@@ -0,0 +1,120 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+# Chemistry keys the API reports as numbers, sometimes with a bound like "< 300" or "> 8.5"
+NUMERIC_CHEMISTRY_KEYS = ("currentPh", "setPointPh", "currentORP", "setPointORP")
+_NUMBER = re.compile(r"([<>]=?)?\s*([-+]?[0-9]*\.?[0-9]+)")
+
+@dataclass(frozen=True, slots=True)
+class Reading:
+    """One chemistry value as reported by the API, parsed once."""
+
+    raw: Any
+    value: float | None = None
+    comparator: str | None = None  # "<" or ">" when the API only reports a bound
+
+    @property
+    def valid(self) -> bool:
+        return self.value is not None
+
+def parse_reading(raw) -> Reading:
+    """Parse a numeric reading, handling strings with comparison prefixes like '< 300' or '> 8.5'."""
+    if raw is None or isinstance(raw, bool):
+        return Reading(raw)
+    if isinstance(raw, str):
+        match = _NUMBER.search(raw)
+        if not match:
+            return Reading(raw)
+        return Reading(raw, float(match.group(2)), match.group(1))
+    try:
+        return Reading(raw, float(raw))
+    except (ValueError, TypeError):
+        return Reading(raw)
+
+def parse_chemistry(pool_chemistry) -> Mapping[str, Reading]:
+    """Turn the raw poolChemistry dict into a read-only mapping of Readings."""
+    readings = {}
+    for key, raw in (pool_chemistry or {}).items():
+        if key in NUMERIC_CHEMISTRY_KEYS:
+            reading = parse_reading(raw)
+            if not reading.valid:
+                _LOGGER.warning("Invalid or missing data for key '%s': %s", key, raw)
+        else:
+            reading = Reading(raw)
+        readings[key] = reading
+    for key in NUMERIC_CHEMISTRY_KEYS:
+        if key not in readings:
+            _LOGGER.warning("Invalid or missing data for key '%s': %s", key, None)
+            readings[key] = Reading(None)
+    return MappingProxyType(readings)
+
+@dataclass(frozen=True, slots=True)
+class SystemSnapshot:
+    """Everything the entities of one system read, built once per refresh."""
+
+    updated: datetime = field(compare=False)  # Left out of equality so identical refreshes don't notify listeners
+    timers: tuple = ()
+    temperature: float | None = None
+    chlorinating: bool = False
+    chlorinating_minutes: int = 0  # Minutes per day covered by enabled chlorinator timers
+    next_change: datetime | None = None  # When chlorinating next starts or stops
+    chemistry: Mapping[str, Reading] | None = None  # None until chemistry has been read during a chlorinator run
+    chemistry_updated: datetime | None = None
+    stale: bool = False  # Some or all values are older than intended because a refresh failed or hasn't happened yet
+    errors: tuple = ()  # Endpoints whose last fetch failed
+    history: Mapping[str, Any] | None = None  # RollingStats per history series
+    rejected: Mapping[str, int] | None = None  # Readings dropped by the spike filter, per chemistry key
+
+    def reading(self, key) -> Reading | None:
+        """Return the chemistry Reading for a key, or None if there is no chemistry yet."""
+        if self.chemistry is None:
+            return None
+        return self.chemistry.get(key)
+
+def diff_snapshots(old: SystemSnapshot | None, new: SystemSnapshot):
+    """Return the entity keys whose values differ between two snapshots, or None if everything should update.
+
+    Keys are chemistry keys (which also cover rejected reading counts), "temperature", "chemistry_updated" (which also
+    covers staleness and endpoint errors), "schedule" (timers, chlorinating state or the next change) and
+    "timer_<index>" for each timer and "history_<series>" for each history series.
+    """
+    if old is None:
+        return None
+
+    changed = set()
+    if old.temperature != new.temperature:
+        changed.add("temperature")
+
+    old_chemistry = old.chemistry or {}
+    new_chemistry = new.chemistry or {}
+    for key in old_chemistry.keys() | new_chemistry.keys():
+        if old_chemistry.get(key) != new_chemistry.get(key):
+            changed.add(key)
+    old_rejected = old.rejected or {}
+    new_rejected = new.rejected or {}
+    for key in old_rejected.keys() | new_rejected.keys():
+        if old_rejected.get(key) != new_rejected.get(key):
+            changed.add(key)
+
+    if old.chemistry_updated != new.chemistry_updated or old.stale != new.stale or old.errors != new.errors:
+        changed.add("chemistry_updated")
+
+    for i in range(max(len(old.timers), len(new.timers))):
+        if old.timers[i:i + 1] != new.timers[i:i + 1]:
+            changed.add(f"timer_{i}")
+    if old.timers != new.timers or old.chlorinating != new.chlorinating or old.next_change != new.next_change:
+        changed.add("schedule")
+
+    old_history = old.history or {}
+    new_history = new.history or {}
+    for name in old_history.keys() | new_history.keys():
+        if old_history.get(name) != new_history.get(name):
+            changed.add(f"history_{name}")
+
+    return changed
@@ -0,0 +1,93 @@
+import logging
+from datetime import datetime, timezone
+from homeassistant.const import UnitOfElectricPotential, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+from .const import DOMAIN
+from .history import ChemistryHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+# Display name and unit of the long-term statistic kept for each history series
+STATISTIC_SERIES = {
+    "ph": ("pH", None),
+    "orp": ("ORP", UnitOfElectricPotential.MILLIVOLT),
+    "temperature": ("Temperature", UnitOfTemperature.CELSIUS),
+}
+
+def hourly_buckets(samples, since: float, until: float):
+    """Group [epoch seconds, value] samples in [since, until) into hours.
+
+    Returns (hour start, mean, min, max) tuples, oldest first.
+    """
+    buckets = []
+    for when, value in samples:
+        if when < since or when >= until:
+            continue
+        hour = when - when % 3600
+        if buckets and buckets[-1][0] == hour:
+            bucket = buckets[-1]
+            bucket[1] += value
+            bucket[2] += 1
+            bucket[3] = min(bucket[3], value)
+            bucket[4] = max(bucket[4], value)
+        else:
+            buckets.append([hour, value, 1, value, value])
+    return [(hour, total / count, low, high) for hour, total, count, low, high in buckets]
+
+class StatisticsImporter:
+    """Imports one system's history into Home Assistant long-term statistics, an hour at a time.
+
+    Only complete hours are imported, each series in one batch per call, so the
+    recorder gets a handful of inserts per hour instead of compiling
+    statistics from every state change. imported_until is saved with the
+    snapshot cache, so samples still in the cache after a restart are
+    backfilled without rewriting hours that were already imported.
+    """
+
+    def __init__(self, hass: HomeAssistant, system_id):
+        self.hass = hass
+        self.system_id = system_id
+        self.imported_until = {}  # Epoch seconds, per series
+
+    def statistic_id(self, name):
+        return f"{DOMAIN}:{slugify(f'system_{self.system_id}_{name}')}"
+
+    def load(self, data):
+        self.imported_until = {name: float(until) for name, until in (data or {}).items()}
+
+    def to_dict(self) -> dict:
+        return dict(self.imported_until)
+
+    @callback
+    def async_import(self, history: ChemistryHistory, now: datetime) -> bool:
+        """Import every complete hour not imported yet. Returns True if anything was imported."""
+        if "recorder" not in self.hass.config.components:
+            return False
+        # Imported here so the recorder's modules only load once it's running
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        current_hour = now.timestamp() - now.timestamp() % 3600
+        imported = False
+        for name, series in history.series.items():
+            buckets = hourly_buckets(series.samples(), self.imported_until.get(name, 0), current_hour)
+            if not buckets:
+                continue
+            label, unit = STATISTIC_SERIES[name]
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"INSNRG {self.system_id} {label}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(name),
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(self.hass, metadata, [
+                StatisticData(start=datetime.fromtimestamp(hour, timezone.utc), mean=mean, min=low, max=high)
+                for hour, mean, low, high in buckets
+            ])
+            _LOGGER.debug(f"Imported {len(buckets)} hours of {name} statistics for system {self.system_id}")
+            self.imported_until[name] = current_hour
+            imported = True
+        return imported
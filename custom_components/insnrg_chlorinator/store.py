@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+from .snapshot import SystemSnapshot, parse_chemistry
+
+_LOGGER = logging.getLogger(__name__)
+STORAGE_VERSION = 1
+
+def _to_iso(value):
+    return value.isoformat() if value else None
+
+def _from_iso(value):
+    return datetime.fromisoformat(value) if value else None
+
+def snapshot_to_dict(snapshot: SystemSnapshot) -> dict:
+    """Serialize a snapshot, keeping the raw chemistry values so they are parsed again on load."""
+    return {
+        "updated": _to_iso(snapshot.updated),
+        "timers": list(snapshot.timers),
+        "temperature": snapshot.temperature,
+        "chlorinating": snapshot.chlorinating,
+        "chemistry": (
+            {key: reading.raw for key, reading in snapshot.chemistry.items()}
+            if snapshot.chemistry is not None else None
+        ),
+        "chemistry_updated": _to_iso(snapshot.chemistry_updated),
+    }
+
+def snapshot_from_dict(data: dict) -> SystemSnapshot:
+    chemistry = data.get("chemistry")
+    return SystemSnapshot(
+        updated=_from_iso(data["updated"]),
+        timers=tuple(data.get("timers") or ()),
+        temperature=data.get("temperature"),
+        chlorinating=data.get("chlorinating", False),
+        chemistry=parse_chemistry(chemistry) if chemistry is not None else None,
+        chemistry_updated=_from_iso(data.get("chemistry_updated")),
+        # Cached data is stale until the first refresh replaces it
+        stale=True,
+    )
+
+class SnapshotStore:
+    """Keeps the last good snapshot of every system of a config entry on disk."""
+
+    def __init__(self, hass: HomeAssistant, entry_id):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        # Saved chemistry history and statistics import progress keyed by system ID, filled in by async_load
+        self.history = {}
+        self.statistics = {}
+
+    async def async_load(self):
+        """Return the saved snapshots keyed by system ID, or None if there are none."""
+        try:
+            data = await self._store.async_load()
+            if not data:
+                return None
+            self.history = data.get("history") or {}
+            self.statistics = data.get("statistics") or {}
+            return {system_id: snapshot_from_dict(snapshot) for system_id, snapshot in data["systems"].items()}
+        except Exception as err:
+            # A broken cache only costs us a blocking first refresh
+            _LOGGER.warning(f"Ignoring unreadable snapshot cache: {err}")
+            return None
+
+    @callback
+    def async_save(self, snapshots, history=None, statistics=None):
+        """Schedule a save of the given snapshots, ChemistryHistory and StatisticsImporter objects.
+
+        Bursts of refreshes are coalesced into one write.
+        """
+        history = history or {}
+        statistics = statistics or {}
+        self._store.async_delay_save(
+            lambda: {
+                "systems": {str(system_id): snapshot_to_dict(snapshot) for system_id, snapshot in snapshots.items()},
+                "history": {str(system_id): system_history.to_dict() for system_id, system_history in history.items()},
+                "statistics": {str(system_id): importer.to_dict() for system_id, importer in statistics.items()},
+            },
+            SNAPSHOT_SAVE_DELAY,
+        )
+
+    async def async_remove(self):
+        await self._store.async_remove()
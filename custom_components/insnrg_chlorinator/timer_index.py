@@ -0,0 +1,86 @@
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+_LOGGER = logging.getLogger(__name__)
+MINUTES_PER_DAY = 24 * 60
+
+def _parse_minutes(hhmm):
+    """Convert an "HH:MM" string to minutes since midnight, or None if unparseable."""
+    try:
+        hour, minute = (int(part) for part in hhmm.split(":"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not (0 <= hour <= 24 and 0 <= minute < 60):
+        return None
+    return min(hour * 60 + minute, MINUTES_PER_DAY)
+
+def _minute_of_day(when: datetime) -> float:
+    return when.hour * 60 + when.minute + when.second / 60 + when.microsecond / 60_000_000
+
+class TimerIndex:
+    """Sorted index of the enabled chlorinator timer windows.
+
+    Windows are held as merged, non-overlapping [start, stop) ranges in minutes
+    since midnight. A window that crosses midnight is split in two, so "is
+    chlorinating" and "next change" are both a bisect away.
+    """
+
+    __slots__ = ("_starts", "_stops", "_transitions", "total_minutes")
+
+    def __init__(self, timers=None):
+        intervals = []
+        for timer in timers or []:
+            if not (timer.get("enabled") and timer.get("chlorinator")):
+                continue
+            start = _parse_minutes(timer.get("start_time"))
+            stop = _parse_minutes(timer.get("stop_time"))
+            if start is None or stop is None or start == stop:
+                _LOGGER.debug("Ignoring timer %s with unusable window", timer.get("timer_number"))
+                continue
+            if start < stop:
+                intervals.append((start, stop))
+            else:
+                # Crosses midnight
+                intervals.append((start, MINUTES_PER_DAY))
+                intervals.append((0, stop))
+
+        merged = []
+        for start, stop in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], stop)
+            else:
+                merged.append([start, stop])
+
+        self._starts = [start for start, _ in merged]
+        self._stops = [stop for _, stop in merged]
+        self.total_minutes = sum(stop - start for start, stop in merged)
+
+        # Midnight is not a real transition when a window runs across it
+        wraps = bool(merged) and merged[0][0] == 0 and merged[-1][1] == MINUTES_PER_DAY
+        transitions = []
+        for start, stop in merged:
+            if not (wraps and start == 0):
+                transitions.append(start)
+            if not (wraps and stop == MINUTES_PER_DAY):
+                transitions.append(stop)
+        self._transitions = transitions
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def is_active(self, when: datetime) -> bool:
+        """Return True if a chlorinator timer window covers the given time."""
+        minute = _minute_of_day(when)
+        i = bisect_right(self._starts, minute) - 1
+        return i >= 0 and minute < self._stops[i]
+
+    def next_transition(self, when: datetime):
+        """Return when chlorinating next starts or stops after the given time, or None if it never changes."""
+        if not self._transitions:
+            return None
+        midnight = when.replace(hour=0, minute=0, second=0, microsecond=0)
+        i = bisect_right(self._transitions, _minute_of_day(when))
+        if i < len(self._transitions):
+            return midnight + timedelta(minutes=self._transitions[i])
+        return midnight + timedelta(days=1, minutes=self._transitions[0])
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+DATA_TRAFFIC_RECORDER = f"{DOMAIN}_traffic_recorder"
+
+# Values that must never reach a recording
+_SECRET_KEYS = {
+    "AccessToken", "IdToken", "RefreshToken", "REFRESH_TOKEN",
+    "access_token", "id_token", "refresh_token", "Authorization", "password", "Password",
+}
+_SYSTEM_ID_KEYS = {"systemId", "system_id"}
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+
+class TrafficRecorder:
+    """Appends sanitized request/response pairs to a gzip-compressed JSON Lines file.
+
+    Tokens and passwords are redacted, email addresses are masked and system
+    IDs are swapped for stable stand-ins (1001, 1002, ...) so a recording can
+    be shared and replayed with benchmarks/replay_server.py.
+    """
+
+    def __init__(self, hass: HomeAssistant, path):
+        self.hass = hass
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._lock = asyncio.Lock()
+        self._system_ids = {}
+        self._started = time.monotonic()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Appending adds a new gzip member, which readers treat as one continuous stream
+        return gzip.open(self.path, "at", encoding="utf-8")
+
+    async def async_open(self):
+        self._file = await self.hass.async_add_executor_job(self._open)
+
+    async def async_close(self):
+        async with self._lock:
+            if self._file is not None:
+                await self.hass.async_add_executor_job(self._file.close)
+                self._file = None
+        _LOGGER.info(f"Recorded {self.count} exchanges to {self.path}")
+
+    def _system_id(self, value):
+        stand_in = self._system_ids.setdefault(str(value), 1001 + len(self._system_ids))
+        return stand_in if isinstance(value, int) else str(stand_in)
+
+    def sanitize(self, value, key=None):
+        """Return a copy of a decoded JSON value that is safe to share."""
+        if key in _SECRET_KEYS:
+            return "<redacted>"
+        if key in _SYSTEM_ID_KEYS and value is not None:
+            return self._system_id(value)
+        if isinstance(value, dict):
+            return {k: self.sanitize(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.sanitize(v) for v in value]
+        if isinstance(value, str):
+            return _EMAIL.sub("user@example.com", value)
+        return value
+
+    async def async_record(self, kind, request, status, body, latency):
+        """Record one exchange. The body may be raw bytes, text or an already decoded JSON value."""
+        if isinstance(body, (bytes, bytearray)):
+            body = body.decode("utf-8", errors="replace")
+        if isinstance(body, str):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        line = json.dumps({
+            "t": round(time.monotonic() - self._started, 3),
+            "kind": kind,
+            "request": self.sanitize(request),
+            "status": status,
+            "latency": round(latency, 3),
+            "body": self.sanitize(body),
+        })
+        async with self._lock:
+            if self._file is None:
+                return
+            await self.hass.async_add_executor_job(self._file.write, line + "\n")
+            self.count += 1
+
+@callback
+def async_get_traffic_recorder(hass: HomeAssistant) -> TrafficRecorder | None:
+    """Return the active traffic recorder, or None when nothing is being recorded."""
+    return hass.data.get(DATA_TRAFFIC_RECORDER)
+
+async def async_start_recording(hass: HomeAssistant, path) -> TrafficRecorder:
+    recorder = TrafficRecorder(hass, path)
+    await recorder.async_open()
+    hass.data[DATA_TRAFFIC_RECORDER] = recorder
+
+    async def _async_close(_event):
+        if async_get_traffic_recorder(hass) is recorder:
+            await async_stop_recording(hass)
+
+    # An unclosed gzip file loses its buffered tail
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close)
+    _LOGGER.info(f"Recording INSNRG API traffic to {path}")
+    return recorder
+
+async def async_stop_recording(hass: HomeAssistant):
+    recorder = hass.data.pop(DATA_TRAFFIC_RECORDER, None)
+    if recorder is not None:
+        await recorder.async_close()